@@ -1,5 +1,4 @@
 import cv2
-import time
 
 # Path to your video file
 video_path = 'your_video.mp4'
@@ -23,10 +22,8 @@ while cap.isOpened():
     # Display the frame (optional)
     cv2.imshow('Video', frame)
 
-    time.sleep(0.1)
-
     # Exit when 'q' is pressed
-    if cv2.waitKey(25) & 0xFF == ord('q'):
+    if cv2.waitKey(1) & 0xFF == ord('q'):
         break
 
 # Release resources
@@ -144,6 +144,9 @@ esp_err_t recording_config_handler(httpd_req_t *req);
 esp_err_t apply_settings_handler(httpd_req_t *req);
 esp_err_t files_handler(httpd_req_t *req);
 esp_err_t motor_control_handler(httpd_req_t *req);
+esp_err_t batch_handler(httpd_req_t *req);
+void fillStatusJson(JsonObject doc);
+void fillFilesJson(JsonObject doc);
 
 // Settings persistence functions
 void saveSettings() {
@@ -268,6 +271,10 @@ void connectToWiFi() {
       MDNS.addService("http", "tcp", HTTP_PORT);
       MDNS.addServiceTxt("http", "tcp", "device_type", "edge_monitor");
       MDNS.addServiceTxt("http", "tcp", "version", "1.0");
+      // Dedicated service type so the web server can browse for edge monitors
+      // without resolving every HTTP service on the network
+      MDNS.addService("edge-monitor", "tcp", HTTP_PORT);
+      MDNS.addServiceTxt("edge-monitor", "tcp", "version", "1.0");
     } else {
       Serial.println("Error setting up mDNS responder!");
     }
@@ -374,7 +381,7 @@ void startCameraServer() {
   
   httpd_config_t config = HTTPD_DEFAULT_CONFIG();
   config.server_port = HTTP_PORT;
-  config.max_uri_handlers = 10;
+  config.max_uri_handlers = 12;
   config.stack_size = 8192;
   
   // Performance optimizations - run HTTP server on separate core
@@ -439,6 +446,14 @@ void startCameraServer() {
     .user_ctx  = NULL
   };
   
+  // Several read-only endpoints in one round trip
+  httpd_uri_t batch_uri = {
+    .uri       = "/batch",
+    .method    = HTTP_POST,
+    .handler   = batch_handler,
+    .user_ctx  = NULL
+  };
+  
   // Add root endpoint for basic device detection
   httpd_uri_t root_uri = {
     .uri       = "/",
@@ -456,6 +471,7 @@ void startCameraServer() {
     httpd_register_uri_handler(camera_httpd, &apply_settings_uri);
     httpd_register_uri_handler(camera_httpd, &files_uri);
     httpd_register_uri_handler(camera_httpd, &motor_uri);
+    httpd_register_uri_handler(camera_httpd, &batch_uri);
     httpd_register_uri_handler(camera_httpd, &root_uri);
     
     Serial.printf("Camera HTTP server started on port %d\n", HTTP_PORT);
@@ -482,9 +498,7 @@ esp_err_t root_handler(httpd_req_t *req) {
   return ESP_OK;
 }
 
-esp_err_t status_handler(httpd_req_t *req) {
-  JsonDocument doc;
-  
+void fillStatusJson(JsonObject doc) {
   doc["device_type"] = "edge_monitor";
   doc["wifi_connected"] = wifi_connected;
   doc["is_recording"] = isRecording();
@@ -540,6 +554,14 @@ esp_err_t status_handler(httpd_req_t *req) {
     }
   }
   
+  // Advertise POST /batch so clients can fetch /status and /files together
+  doc["batch"] = true;
+}
+
+esp_err_t status_handler(httpd_req_t *req) {
+  JsonDocument doc;
+  fillStatusJson(doc.to<JsonObject>());
+  
   String response;
   serializeJson(doc, response);
   
@@ -1130,8 +1152,7 @@ esp_err_t apply_settings_handler(httpd_req_t *req) {
   return ESP_OK;
 }
 
-esp_err_t files_handler(httpd_req_t *req) {
-  JsonDocument doc;
+void fillFilesJson(JsonObject doc) {
   JsonArray files = doc["files"].to<JsonArray>();
   
   File root = SD.open("/");
@@ -1154,6 +1175,11 @@ esp_err_t files_handler(httpd_req_t *req) {
   
   doc["upload_queue_size"] = videoUploader->getQueueSize();
   doc["total_files"] = files.size();
+}
+
+esp_err_t files_handler(httpd_req_t *req) {
+  JsonDocument doc;
+  fillFilesJson(doc.to<JsonObject>());
   
   String response;
   serializeJson(doc, response);
@@ -1165,6 +1191,61 @@ esp_err_t files_handler(httpd_req_t *req) {
   return ESP_OK;
 }
 
+// POST /batch {"ops": [{"method": "GET", "path": "/status"}, ...]}
+// Answers several read-only requests in one response so clients on WiFi
+// pay for one round trip instead of one per endpoint. Only GET /status
+// and GET /files are supported; other ops get a 404 entry.
+esp_err_t batch_handler(httpd_req_t *req) {
+  char buf[300];
+  if (req->content_len >= sizeof(buf)) {
+    httpd_resp_send_err(req, HTTPD_400_BAD_REQUEST, "Content too long");
+    return ESP_FAIL;
+  }
+  
+  int ret = httpd_req_recv(req, buf, req->content_len);
+  if (ret <= 0) {
+    httpd_resp_send_err(req, HTTPD_400_BAD_REQUEST, "Invalid request");
+    return ESP_FAIL;
+  }
+  buf[ret] = '\0';
+  
+  JsonDocument doc;
+  if (deserializeJson(doc, buf) || !doc["ops"].is<JsonArray>()) {
+    httpd_resp_send_err(req, HTTPD_400_BAD_REQUEST, "Expected {\"ops\": [...]}");
+    return ESP_FAIL;
+  }
+  
+  JsonDocument response;
+  JsonArray results = response["results"].to<JsonArray>();
+  
+  for (JsonObject op : doc["ops"].as<JsonArray>()) {
+    String method = op["method"] | "GET";
+    String path = op["path"] | "";
+    
+    JsonObject result = results.add<JsonObject>();
+    result["path"] = path;
+    
+    if (method == "GET" && path == "/status") {
+      result["status"] = 200;
+      fillStatusJson(result["body"].to<JsonObject>());
+    } else if (method == "GET" && path == "/files") {
+      result["status"] = 200;
+      fillFilesJson(result["body"].to<JsonObject>());
+    } else {
+      result["status"] = 404;
+    }
+  }
+  
+  String responseStr;
+  serializeJson(response, responseStr);
+  
+  httpd_resp_set_type(req, "application/json");
+  httpd_resp_set_hdr(req, "Access-Control-Allow-Origin", "*");
+  httpd_resp_send(req, responseStr.c_str(), responseStr.length());
+  
+  return ESP_OK;
+}
+
 esp_err_t motor_control_handler(httpd_req_t *req) {
   char buf[100];
   int ret = httpd_req_recv(req, buf, sizeof(buf));
@@ -11,13 +11,368 @@ Each frame is saved as 'frame_<number>.<format>' in the specified output directo
 
 import argparse
 import cv2
+import functools
+import io
+import numpy as np
 import os
 import sys
 import re
-import glob
+import fnmatch
+import logging
+import logging.handlers
+import multiprocessing
+import queue
+import shutil
+import struct
+import subprocess
+import tarfile
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
 from pathlib import Path
 
 
+# Per-frame progress and frame warnings go through this logger so they can
+# be buffered (see configure_logging) and skipped entirely with --quiet.
+# Code importing this module sees them once it configures logging itself
+log = logging.getLogger(__name__)
+log.addHandler(logging.NullHandler())
+
+# Number of threads encoding and writing frames to disk
+WRITER_THREADS = min(os.cpu_count() or 1, 4)
+
+# Decoded frames held in memory: one being handled by each writer, one
+# queued behind each, and a couple being decoded. The ring is preallocated,
+# so this costs about 6 MB per slot for 1080p frames
+FRAME_QUEUE_SIZE = WRITER_THREADS * 2 + 2
+
+# Number of threads decoding frame images ahead of the video writer
+DECODER_THREADS = min(os.cpu_count() or 1, 8)
+
+# Number of frame images decoded ahead of the video writer
+DECODE_WINDOW = 16
+
+# ffmpeg encoder arguments for each supported --codec value
+FFMPEG_CODEC_ARGS = {
+    'mp4v': ['-c:v', 'mpeg4'],
+    'XVID': ['-c:v', 'mpeg4', '-vtag', 'xvid'],
+    'H264': ['-c:v', 'libx264', '-preset', 'veryfast', '-pix_fmt', 'yuv420p'],
+    'MJPG': ['-c:v', 'mjpeg'],
+}
+
+# ffmpeg decoders for frame image extensions
+FFMPEG_IMAGE_DECODERS = {
+    '.jpg': 'mjpeg',
+    '.jpeg': 'mjpeg',
+    '.png': 'png',
+    '.bmp': 'bmp',
+    '.tiff': 'tiff',
+    '.webp': 'webp',
+}
+
+# OpenCV hardware decode types for each supported --hwaccel value
+HWACCEL_TYPES = {
+    'none': 'VIDEO_ACCELERATION_NONE',
+    'any': 'VIDEO_ACCELERATION_ANY',
+    'vaapi': 'VIDEO_ACCELERATION_VAAPI',
+    'd3d11': 'VIDEO_ACCELERATION_D3D11',
+    'mfx': 'VIDEO_ACCELERATION_MFX',
+}
+
+# AVI header flags and the denominator used for the stream frame rate
+AVIF_HASINDEX = 0x10
+AVIIF_KEYFRAME = 0x10
+AVI_RATE_SCALE = 1000
+
+_END_OF_STREAM = object()
+
+_NUMBER_RE = re.compile(r'\d+')
+
+# Names written by extract_frames; zero-padded so they sort lexicographically
+_EXTRACTED_FRAME_RE = re.compile(r'frame_\d{6}\.\w+')
+
+
+def natural_sort_key(name):
+    """Sort key ordering numbered file names numerically (frame_2 before frame_10)."""
+    numbers = _NUMBER_RE.findall(name)
+    return [int(num) for num in numbers] if numbers else [0]
+
+
+def sort_frame_names(frame_names):
+    """
+    Sort frame file names in natural order, in place.
+    
+    Frames named by extract_frames are zero-padded to a fixed width, so a
+    plain string sort already gives numeric order and no per-file key is
+    needed.
+    """
+    if all(_EXTRACTED_FRAME_RE.fullmatch(name) for name in frame_names):
+        frame_names.sort()
+    else:
+        frame_names.sort(key=natural_sort_key)
+
+
+def find_frame_names(frames_dir, frame_pattern):
+    """
+    List the names of files in frames_dir matching a glob-style pattern.
+    
+    Uses a single os.scandir pass. Like glob, hidden files only match
+    patterns that start with a dot.
+    """
+    match_hidden = frame_pattern.startswith('.')
+    with os.scandir(frames_dir) as entries:
+        return [
+            entry.name for entry in entries
+            if (match_hidden or not entry.name.startswith('.'))
+            and fnmatch.fnmatchcase(entry.name, frame_pattern)
+            and entry.is_file()
+        ]
+
+
+def open_video_capture(video_path, hwaccel='any'):
+    """
+    Open a video, preferring hardware-accelerated decoding.
+    
+    Args:
+        video_path (str): Path to the video file
+        hwaccel (str): Hardware decode type (see HWACCEL_TYPES)
+        
+    Returns:
+        cv2.VideoCapture: Capture using hardware decoding when available,
+        otherwise the default software decoder
+    """
+    # Hardware decode properties need OpenCV >= 4.5.2
+    if hwaccel != 'none' and hasattr(cv2, 'CAP_PROP_HW_ACCELERATION'):
+        accel = getattr(cv2, HWACCEL_TYPES[hwaccel], None)
+        if accel is not None:
+            cap = cv2.VideoCapture(video_path, cv2.CAP_FFMPEG, [cv2.CAP_PROP_HW_ACCELERATION, accel])
+            if cap.isOpened():
+                return cap
+            cap.release()
+            print(f"⚠️  Warning: Hardware decoding ({hwaccel}) unavailable, using software decoding")
+    
+    return cv2.VideoCapture(video_path)
+
+
+def encode_params_for(image_format, quality):
+    """Return cv2.imencode parameters applying quality to lossy formats."""
+    if image_format in ('jpg', 'jpeg'):
+        return [cv2.IMWRITE_JPEG_QUALITY, quality]
+    if image_format == 'webp':
+        return [cv2.IMWRITE_WEBP_QUALITY, quality]
+    return []
+
+
+class FrameReader:
+    """
+    Decode frames from a video capture on a background thread.
+    
+    Frames are decoded straight into a preallocated ring buffer of
+    ring_size slots, so no memory is allocated per frame. Iterating over
+    the reader yields (frame_number, slot, frame) tuples until the end of
+    the video (or end_frame) is reached; frame is a view of the ring slot.
+    The caller must hand each slot back with release() once it is done
+    with the frame, and the reader waits for a free slot before decoding,
+    which bounds the number of frames held in memory. Pass allocate to
+    place the ring somewhere other than the process heap (for example in
+    shared memory).
+    """
+    
+    def __init__(self, cap, start_frame=0, end_frame=float('inf'), step=1, ring_size=FRAME_QUEUE_SIZE,
+                 allocate=np.empty):
+        self.cap = cap
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.step = step
+        self.ring_size = ring_size
+        self.frame_count = 0
+        self.ring = None
+        self._allocate = allocate
+        self._free_slots = queue.Queue()
+        for slot in range(ring_size):
+            self._free_slots.put(slot)
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    def start(self):
+        self._thread.start()
+        return self
+    
+    def join(self):
+        self._thread.join()
+    
+    def release(self, slot):
+        """Return a ring slot to the reader once its frame has been used."""
+        self._free_slots.put(slot)
+    
+    def _read_into(self, slot):
+        if self.ring is None:
+            # Size the ring from the first decoded frame; container
+            # metadata is unreliable for ESP32 recordings
+            ret, frame = self.cap.read()
+            if ret:
+                self.ring = self._allocate((self.ring_size,) + frame.shape, frame.dtype)
+                self.ring[slot] = frame
+                frame = self.ring[slot]
+            return ret, frame
+        
+        # OpenCV decodes into the slot in place (or returns a new array if
+        # the frame size changed mid-stream)
+        return self.cap.read(self.ring[slot])
+    
+    def _run(self):
+        try:
+            while True:
+                # Frames are read sequentially from start_frame
+                current_frame = self.start_frame + self.frame_count
+                
+                # Check if we've reached the end frame
+                if current_frame > self.end_frame:
+                    break
+                
+                # Check if this frame should be saved (based on step);
+                # skipped frames are only demuxed, never decoded
+                if self.frame_count % self.step == 0:
+                    slot = self._free_slots.get()
+                    ret, frame = self._read_into(slot)
+                    if not ret:
+                        break
+                    self._queue.put((current_frame, slot, frame))
+                elif not self.cap.grab():
+                    break
+                
+                self.frame_count += 1
+        finally:
+            self._queue.put(_END_OF_STREAM)
+    
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is _END_OF_STREAM:
+                return
+            yield item
+
+
+def write_file(path, data):
+    """Write a bytes-like object to path with raw os-level calls."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def read_file(path):
+    """Read a whole file into bytes."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+# Shared-memory rings attached by writer processes, keyed by name
+_attached_rings = {}
+
+
+def _encode_and_write(ring_name, ring_shape, ring_dtype, slot, frame, file_path, extension, encode_params):
+    """
+    Writer process task: encode one frame and write it to file_path.
+    
+    The frame is read from the shared ring slot unless it was passed
+    directly (frame is not None).
+    """
+    if frame is None:
+        if ring_name not in _attached_rings:
+            shm = shared_memory.SharedMemory(name=ring_name)
+            _attached_rings[ring_name] = (shm, np.ndarray(ring_shape, ring_dtype, buffer=shm.buf))
+        frame = _attached_rings[ring_name][1][slot]
+    
+    success, encoded = cv2.imencode(extension, frame, encode_params)
+    if success:
+        write_file(file_path, encoded)
+    return success
+
+
+class TarFrameWriter:
+    """
+    Append encoded frames to a single uncompressed tar archive.
+    
+    Every frame becomes one sequential append to the same file instead of a
+    new file, which avoids creating thousands of small files. push() is
+    thread-safe; call close() when done.
+    """
+    
+    def __init__(self, tar_path):
+        self._tar = tarfile.open(tar_path, 'w')
+        self._mtime = time.time()
+        self._lock = threading.Lock()
+    
+    def push(self, path, data):
+        info = tarfile.TarInfo(name=os.path.basename(path))
+        info.size = len(data)
+        info.mtime = self._mtime
+        with self._lock:
+            self._tar.addfile(info, io.BytesIO(data))
+    
+    def close(self):
+        self._tar.close()
+
+
+class TarFrameSource:
+    """
+    Read frame images stored in a tar archive written with --tar.
+    
+    read_bytes() and load_frame() are safe to call from several threads.
+    """
+    
+    def __init__(self, tar_path):
+        self._tar = tarfile.open(tar_path, 'r')
+        self._members = {m.name: m for m in self._tar.getmembers() if m.isfile()}
+        self._lock = threading.Lock()
+    
+    def names(self, frame_pattern):
+        """Return the names of archived frames matching a glob-style pattern."""
+        return [name for name in self._members if fnmatch.fnmatchcase(os.path.basename(name), frame_pattern)]
+    
+    def read_bytes(self, name):
+        with self._lock:
+            return self._tar.extractfile(self._members[name]).read()
+    
+    def load_frame(self, name):
+        return cv2.imdecode(np.frombuffer(self.read_bytes(name), np.uint8), cv2.IMREAD_COLOR)
+    
+    def close(self):
+        self._tar.close()
+
+
+def configure_logging(quiet=False):
+    """
+    Buffer per-frame progress messages and write them to stdout in batches.
+    
+    Warnings flush the buffer immediately so they stay in order with the
+    progress output. With quiet=True progress messages are dropped. main()
+    calls this; other callers of extract_frames and frames_to_video can call
+    it too, or configure logging their own way.
+    """
+    handler = logging.handlers.MemoryHandler(
+        capacity=1024,
+        flushLevel=logging.WARNING,
+        target=logging.StreamHandler(sys.stdout),
+    )
+    log.addHandler(handler)
+    log.setLevel(logging.WARNING if quiet else logging.INFO)
+    log.propagate = False
+
+
+def flush_progress():
+    """Write out any buffered progress messages."""
+    for handler in log.handlers:
+        handler.flush()
+
+
 def validate_video_file(video_path):
     """
     Validate that the video file is readable and contains actual video data.
@@ -34,11 +389,12 @@ def validate_video_file(video_path):
         if not cap.isOpened():
             return False, "Could not open video file"
         
-        # Try to read the first frame
-        ret, frame = cap.read()
+        # Demux the first frame without decoding it
+        ret = cap.grab()
+        width = cap.get(cv2.CAP_PROP_FRAME_WIDTH)
         cap.release()
         
-        if not ret or frame is None:
+        if not ret or width <= 0:
             return False, "Video file contains no readable frames"
         
         return True, "Video file appears valid"
@@ -47,7 +403,83 @@ def validate_video_file(video_path):
         return False, f"Error validating video: {str(e)}"
 
 
-def extract_frames(video_path, output_dir, image_format='jpg', start_frame=0, end_frame=None, step=1):
+def _extract_with_processes(cap, start_frame, end_frame, step, processes, path_prefix, extension, encode_params):
+    """
+    Encode and write extracted frames on a pool of worker processes.
+    
+    Frames are decoded into a ring buffer in shared memory, so only the
+    ring slot index is sent to the workers instead of the pixel data.
+    
+    Returns:
+        tuple: (frames processed, frames saved)
+    """
+    shm = None
+    
+    def allocate(shape, dtype):
+        nonlocal shm
+        size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        shm = shared_memory.SharedMemory(create=True, size=size)
+        return np.ndarray(shape, dtype, buffer=shm.buf)
+    
+    lock = threading.Lock()
+    saved_count = 0
+    failures = []
+    reader = FrameReader(cap, start_frame, end_frame, step, ring_size=processes * 2 + 2, allocate=allocate)
+    
+    def on_done(current_frame, slot, file_path, future):
+        nonlocal saved_count
+        reader.release(slot)
+        try:
+            success = future.result()
+        except OSError as e:
+            log.warning("Warning: Failed to write %s: %s", file_path, e)
+            return
+        except Exception as e:
+            # Re-raised once all frames are done
+            failures.append(e)
+            return
+        
+        if success:
+            with lock:
+                saved_count += 1
+                count = saved_count
+            if count % 10 == 0 or count <= 10:
+                log.info("Saved frame %d -> %s", current_frame, os.path.basename(file_path))
+        else:
+            log.warning("Warning: Failed to save frame %d", current_frame)
+    
+    frame = None
+    # Workers are spawned rather than forked because the reader thread
+    # may be inside OpenCV when a worker process is started
+    executor = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        with executor:
+            reader.start()
+            for current_frame, slot, frame in reader:
+                file_path = f"{path_prefix}{current_frame:06d}{extension}"
+                # Frames whose size changed mid-stream do not fit the ring
+                # and are sent to the worker directly
+                in_ring = frame.ctypes.data == reader.ring[slot].ctypes.data
+                future = executor.submit(
+                    _encode_and_write, shm.name, reader.ring.shape, reader.ring.dtype.str,
+                    slot, None if in_ring else frame, file_path, extension, encode_params
+                )
+                future.add_done_callback(functools.partial(on_done, current_frame, slot, file_path))
+        reader.join()
+    finally:
+        if shm is not None:
+            # Drop views of the ring so the shared memory can be closed
+            reader.ring = frame = None
+            shm.close()
+            shm.unlink()
+    
+    if failures:
+        raise failures[0]
+    return reader.frame_count, saved_count
+
+
+def extract_frames(video_path, output_dir, image_format='jpg', start_frame=0, end_frame=None, step=1, quality=95,
+                   hwaccel='any', processes=0, tar=False):
     """
     Extract frames from a video file and save them as images.
     
@@ -58,13 +490,24 @@ def extract_frames(video_path, output_dir, image_format='jpg', start_frame=0, en
         start_frame (int): Starting frame number (0-based)
         end_frame (int): Ending frame number (None for all frames)
         step (int): Frame step (1 = every frame, 2 = every other frame, etc.)
+        quality (int): Encoding quality for jpg/webp output (1-100)
+        hwaccel (str): Hardware decode type ('none', 'any', 'vaapi', 'd3d11', 'mfx')
+        processes (int): Number of writer processes (0 = use writer threads)
+        tar (bool): Append frames to '<output_dir>.tar' instead of writing
+            one file per frame (not supported with processes)
     
     Returns:
         int: Number of frames extracted
+    
+    Per-frame progress and warnings are logged to this module's logger;
+    configure logging (or call configure_logging) to see them.
     """
     
+    if tar and processes > 0:
+        raise ValueError("Tar output cannot be combined with writer processes")
+    
     # Open the video file
-    cap = cv2.VideoCapture(video_path)
+    cap = open_video_capture(video_path, hwaccel)
     
     if not cap.isOpened():
         raise ValueError(f"Error: Could not open video file '{video_path}'")
@@ -119,75 +562,122 @@ def extract_frames(video_path, output_dir, image_format='jpg', start_frame=0, en
         if effective_end_frame < start_frame:
             raise ValueError(f"End frame {effective_end_frame} must be >= start frame {start_frame}")
     
-    # Create output directory
+    # Create output directory (or the directory holding the tar archive)
     output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
+    if tar:
+        output_path = output_path.with_name(output_path.name + '.tar')
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+    else:
+        output_path.mkdir(parents=True, exist_ok=True)
     
     if use_frame_by_frame:
         print(f"Extracting frames starting from {start_frame} (step={step}) until end of video")
     else:
         print(f"Extracting frames {start_frame} to {effective_end_frame} (step={step})")
-    print(f"Output directory: {output_path.absolute()}")
+    print(f"Output {'archive' if tar else 'directory'}: {output_path.absolute()}")
     print(f"Image format: {image_format.upper()}")
     print()
     
     # Extract frames
     frame_count = 0
     saved_count = 0
+    failures = []
     
-    # Set starting position (skip if problematic)
+    # Set starting position (skip if problematic). Seeks often land on a
+    # nearby keyframe rather than the exact frame, so the position reached
+    # is read back and any remaining frames are skipped by hand below
+    position = 0
     try:
         cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
     except:
         print(f"⚠️  Warning: Could not seek to frame {start_frame}, starting from beginning")
         start_frame = 0
+        position = -1
     
-    # Skip to start frame manually if seeking failed
-    if start_frame > 0:
-        for i in range(start_frame):
-            ret, _ = cap.read()
-            if not ret:
-                print(f"⚠️  Warning: Could only read {i} frames, starting from frame {i}")
-                start_frame = i
-                break
-    
-    while True:
-        ret, frame = cap.read()
-        
-        if not ret:
+    # Frames can only be skipped forwards, so a seek that overshot (or left
+    # the position unknown) starts over from the beginning of the video
+    if position > start_frame or position < 0:
+        cap.release()
+        cap = open_video_capture(video_path, hwaccel)
+        position = 0
+    
+    # Skip to start frame manually if seeking fell short
+    for i in range(position, start_frame):
+        if not cap.grab():
+            print(f"⚠️  Warning: Could only read {i} frames, starting from frame {i}")
+            start_frame = i
             break
+    
+    encode_params = encode_params_for(image_format, quality)
+    extension = f".{image_format}"
+    # Built once so each frame only formats its number into the path
+    path_prefix = os.path.join(str(output_path), "frame_")
+    
+    if processes > 0:
+        frame_count, saved_count = _extract_with_processes(
+            cap, start_frame, effective_end_frame, step, processes, path_prefix, extension, encode_params
+        )
+        flush_progress()
+    else:
+        lock = threading.Lock()
+        writer = TarFrameWriter(output_path) if tar else None
         
-        # Get current frame position (or calculate manually if unreliable)
-        try:
-            current_frame = int(cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1
-        except:
-            current_frame = start_frame + frame_count
+        def save_frame(current_frame, slot, frame):
+            nonlocal saved_count
+            # Create filename
+            file_path = f"{path_prefix}{current_frame:06d}{extension}"
         
-        # Check if we've reached the end frame (only if not using frame-by-frame mode)
-        if not use_frame_by_frame and current_frame > effective_end_frame:
-            break
+            # Encode the frame and write it out
+            try:
+                success, encoded = cv2.imencode(extension, frame, encode_params)
+            finally:
+                reader.release(slot)
         
-        # Check if this frame should be saved (based on step)
-        if (current_frame - start_frame) % step == 0:
-            # Create filename
-            filename = f"frame_{current_frame:06d}.{image_format}"
-            file_path = output_path / filename
+            if not success:
+                log.warning("Warning: Failed to save frame %d", current_frame)
+                return
             
-            # Save the frame
-            success = cv2.imwrite(str(file_path), frame)
+            if writer is not None:
+                writer.push(file_path, encoded)
+            else:
+                try:
+                    write_file(file_path, encoded)
+                except OSError as e:
+                    log.warning("Warning: Failed to write %s: %s", file_path, e)
+                    return
             
-            if success:
+            with lock:
                 saved_count += 1
-                if saved_count % 10 == 0 or saved_count <= 10:
-                    print(f"Saved frame {current_frame} -> {filename}")
-            else:
-                print(f"Warning: Failed to save frame {current_frame}")
+                count = saved_count
+            if count % 10 == 0 or count <= 10:
+                log.info("Saved frame %d -> %s", current_frame, os.path.basename(file_path))
+        
+        reader = FrameReader(cap, start_frame, effective_end_frame, step).start()
         
-        frame_count += 1
+        # save_frame only handles the errors it can skip a frame for; anything
+        # else (such as a failed tar append) is re-raised once all frames are done
+        def check_saved(future):
+            if future.exception() is not None:
+                failures.append(future.exception())
+        
+        try:
+            with ThreadPoolExecutor(max_workers=WRITER_THREADS) as executor:
+                for current_frame, slot, frame in reader:
+                    executor.submit(save_frame, current_frame, slot, frame).add_done_callback(check_saved)
+        finally:
+            if tar:
+                writer.close()
+        reader.join()
+        flush_progress()
+        frame_count = reader.frame_count
     
     # Clean up
     cap.release()
     
+    if failures:
+        raise failures[0]
+    
     print(f"\nExtraction complete!")
     print(f"Processed {frame_count} frames")
     print(f"Saved {saved_count} images to '{output_path}'")
@@ -195,12 +685,219 @@ def extract_frames(video_path, output_dir, image_format='jpg', start_frame=0, en
     return saved_count
 
 
+def is_jpeg_sequence(frame_files):
+    """Return True if every frame file has a JPEG extension."""
+    return all(os.path.splitext(f)[1].lower() in ('.jpg', '.jpeg') for f in frame_files)
+
+
+def _avi_headers(width, height, fps, frame_count, max_frame_size, riff_size, movi_size):
+    """Build the RIFF/AVI header up to and including the 'movi' list header."""
+    # Main AVI header (avih), flagged as having an idx1 index
+    avih = struct.pack(
+        '<14I',
+        round(1_000_000 / fps), int(max_frame_size * fps), 0, AVIF_HASINDEX,
+        frame_count, 0, 1, max_frame_size, width, height, 0, 0, 0, 0
+    )
+    # Video stream header (strh); rate/scale is the frame rate
+    strh = struct.pack(
+        '<4s4sIHHIIIIIIiI4h',
+        b'vids', b'MJPG', 0, 0, 0, 0, AVI_RATE_SCALE, round(fps * AVI_RATE_SCALE), 0,
+        frame_count, max_frame_size, -1, 0, 0, 0, width, height
+    )
+    # Stream format (strf): BITMAPINFOHEADER for MJPEG frames
+    strf = struct.pack(
+        '<IiiHH4sIiiII',
+        40, width, height, 1, 24, b'MJPG', width * height * 3, 0, 0, 0, 0
+    )
+    strl = b'strl' + b'strh' + struct.pack('<I', len(strh)) + strh + b'strf' + struct.pack('<I', len(strf)) + strf
+    hdrl = (b'hdrl' + b'avih' + struct.pack('<I', len(avih)) + avih +
+            b'LIST' + struct.pack('<I', len(strl)) + strl)
+    return (b'RIFF' + struct.pack('<I', riff_size) + b'AVI ' +
+            b'LIST' + struct.pack('<I', len(hdrl)) + hdrl +
+            b'LIST' + struct.pack('<I', movi_size) + b'movi')
+
+
+def compose_mjpg_passthrough(frame_files, output_video, fps, width, height, read_bytes=read_file):
+    """
+    Write JPEG frames into an MJPEG AVI without decoding or re-encoding them.
+    
+    Each JPEG file is copied byte-for-byte into a '00dc' chunk, so the
+    output keeps the original frame quality. The AVI header and the idx1
+    index are written once all frames are known. Plain RIFF AVI is limited
+    to 4 GB.
+    
+    Returns:
+        int: Number of frames processed
+    """
+    index = []
+    movi_size = 4
+    max_frame_size = 0
+    
+    with open(output_video, 'wb') as out:
+        # Reserve space for the header; it is rewritten with final sizes below
+        header_size = len(_avi_headers(width, height, fps, 0, 0, 0, 0))
+        out.write(b'\0' * header_size)
+        
+        for frame_file in frame_files:
+            try:
+                data = read_bytes(frame_file)
+            except OSError:
+                log.warning("⚠️  Warning: Could not read frame %s, skipping", frame_file)
+                continue
+            
+            size = len(data)
+            # idx1 offsets are relative to the 'movi' fourcc
+            index.append((movi_size, size))
+            out.write(b'00dc' + struct.pack('<I', size))
+            out.write(data)
+            if size & 1:
+                out.write(b'\0')
+            movi_size += 8 + size + (size & 1)
+            max_frame_size = max(max_frame_size, size)
+            
+            # Progress indicator
+            processed_count = len(index)
+            if processed_count % 10 == 0 or processed_count <= 10:
+                log.info("Processed frame %d/%d: %s", processed_count, len(frame_files), os.path.basename(frame_file))
+        
+        out.write(b'idx1' + struct.pack('<I', 16 * len(index)))
+        out.write(b''.join(
+            struct.pack('<4sIII', b'00dc', AVIIF_KEYFRAME, offset, size) for offset, size in index
+        ))
+        riff_size = out.tell() - 8
+        
+        out.seek(0)
+        out.write(_avi_headers(width, height, fps, len(index), max_frame_size, riff_size, movi_size))
+    
+    return len(index)
+
+
+def _compose_with_ffmpeg(ffmpeg, frame_files, output_video, fps, codec, width, height, read_bytes=read_file):
+    """
+    Compose frames into a video by piping the image files straight into ffmpeg.
+    
+    Frames are never decoded in Python. When composing MJPG from JPEG frames
+    the JPEG data is copied into the container as-is; otherwise ffmpeg decodes
+    and encodes the frames itself.
+    
+    Returns:
+        int: Number of frames processed
+    """
+    extension = os.path.splitext(frame_files[0])[1].lower()
+    passthrough = codec == 'MJPG' and is_jpeg_sequence(frame_files)
+    
+    cmd = [ffmpeg, '-y', '-loglevel', 'error', '-f', 'image2pipe', '-framerate', str(fps)]
+    if extension in FFMPEG_IMAGE_DECODERS:
+        cmd += ['-c:v', FFMPEG_IMAGE_DECODERS[extension]]
+    cmd += ['-i', '-']
+    if passthrough:
+        cmd += ['-c:v', 'copy']
+    else:
+        cmd += ['-vf', f'scale={width}:{height}'] + FFMPEG_CODEC_ARGS[codec]
+    cmd.append(str(output_video))
+    
+    processed_count = 0
+    # ffmpeg's errors go to a file rather than a pipe: nothing reads them
+    # until all frames are written, and a full pipe would block ffmpeg
+    # (and with it this loop) for good
+    errors = tempfile.TemporaryFile()
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=errors)
+    
+    try:
+        for frame_file in frame_files:
+            try:
+                data = read_bytes(frame_file)
+            except OSError:
+                log.warning("⚠️  Warning: Could not read frame %s, skipping", frame_file)
+                continue
+            
+            proc.stdin.write(data)
+            processed_count += 1
+            
+            # Progress indicator
+            if processed_count % 10 == 0 or processed_count <= 10:
+                log.info("Processed frame %d/%d: %s", processed_count, len(frame_files), os.path.basename(frame_file))
+    except BrokenPipeError:
+        # ffmpeg exited early; its error output is reported below
+        pass
+    finally:
+        try:
+            proc.stdin.close()
+        except BrokenPipeError:
+            pass
+    
+    with errors:
+        returncode = proc.wait()
+        errors.seek(0)
+        stderr = errors.read().decode(errors='replace').strip()
+    if returncode != 0:
+        raise ValueError(f"ffmpeg failed to compose video with codec '{codec}': {stderr}")
+    
+    return processed_count
+
+
+def _compose_with_opencv(frame_files, output_video, fps, codec, width, height, load_frame=cv2.imread):
+    """
+    Compose frames into a video by decoding them and writing them with OpenCV.
+    
+    Used when ffmpeg is not installed. Frame images are decoded on a thread
+    pool a few frames ahead of the (single-threaded) video writer.
+    
+    Returns:
+        int: Number of frames processed
+    """
+    # Initialize video writer
+    fourcc = cv2.VideoWriter_fourcc(*codec)
+    out = cv2.VideoWriter(output_video, fourcc, fps, (width, height))
+    
+    if not out.isOpened():
+        raise ValueError(f"Could not initialize video writer with codec '{codec}'")
+    
+    # Process each frame
+    processed_count = 0
+    
+    with ThreadPoolExecutor(max_workers=DECODER_THREADS) as executor:
+        # Keep a window of decodes in flight ahead of the writer
+        futures = deque(executor.submit(load_frame, f) for f in frame_files[:DECODE_WINDOW])
+        
+        for i, frame_file in enumerate(frame_files):
+            next_index = i + DECODE_WINDOW
+            if next_index < len(frame_files):
+                futures.append(executor.submit(load_frame, frame_files[next_index]))
+            
+            # Read frame
+            frame = futures.popleft().result()
+            
+            if frame is None:
+                log.warning("⚠️  Warning: Could not read frame %s, skipping", frame_file)
+                continue
+            
+            # Check if frame dimensions match
+            if frame.shape[:2] != (height, width):
+                log.warning("⚠️  Warning: Frame %s has different dimensions, resizing", frame_file)
+                frame = cv2.resize(frame, (width, height))
+            
+            # Write frame to video
+            out.write(frame)
+            processed_count += 1
+            
+            # Progress indicator
+            if processed_count % 10 == 0 or processed_count <= 10:
+                log.info("Processed frame %d/%d: %s", processed_count, len(frame_files), os.path.basename(frame_file))
+    
+    # Clean up
+    out.release()
+    
+    return processed_count
+
+
 def frames_to_video(frames_dir, output_video, fps=25.0, frame_pattern="frame_*.jpg", codec='mp4v'):
     """
     Convert a directory of frame images to an MP4 video.
     
     Args:
-        frames_dir (str): Directory containing frame images
+        frames_dir (str): Directory containing frame images, or a tar archive
+            of frames written by extract_frames with tar=True
         output_video (str): Path for output video file
         fps (float): Frames per second for output video
         frame_pattern (str): Glob pattern to match frame files
@@ -208,6 +905,9 @@ def frames_to_video(frames_dir, output_video, fps=25.0, frame_pattern="frame_*.j
     
     Returns:
         int: Number of frames processed
+    
+    Per-frame progress and warnings are logged to this module's logger;
+    configure logging (or call configure_logging) to see them.
     """
     
     frames_path = Path(frames_dir)
@@ -215,27 +915,42 @@ def frames_to_video(frames_dir, output_video, fps=25.0, frame_pattern="frame_*.j
     if not frames_path.exists():
         raise ValueError(f"Frames directory '{frames_dir}' does not exist")
     
+    if frames_path.is_file():
+        source = TarFrameSource(frames_path)
+        try:
+            return _frames_to_video(source.names(frame_pattern), '', frames_dir, output_video, fps, frame_pattern,
+                                    codec, read_bytes=source.read_bytes, load_frame=source.load_frame)
+        finally:
+            source.close()
+    
     # Find all frame files matching the pattern
-    frame_files = glob.glob(str(frames_path / frame_pattern))
+    frame_names = find_frame_names(frames_path, frame_pattern)
     
-    if not frame_files:
+    return _frames_to_video(frame_names, frames_dir, frames_dir, output_video, fps, frame_pattern, codec)
+
+
+def _frames_to_video(frame_names, frames_root, frames_dir, output_video, fps, frame_pattern, codec,
+                     read_bytes=read_file, load_frame=cv2.imread):
+    """
+    Compose named frames into a video.
+    
+    Frame names are joined to frames_root and read with read_bytes() or
+    load_frame(), so the same code serves directories and tar archives.
+    """
+    if not frame_names:
         raise ValueError(f"No frame files found matching pattern '{frame_pattern}' in '{frames_dir}'")
     
     # Sort files naturally (frame_1.jpg, frame_2.jpg, ..., frame_10.jpg)
-    def natural_sort_key(filename):
-        # Extract numbers from filename for proper sorting
-        numbers = re.findall(r'\d+', os.path.basename(filename))
-        return [int(num) for num in numbers] if numbers else [0]
-    
-    frame_files.sort(key=natural_sort_key)
+    sort_frame_names(frame_names)
+    frame_files = [os.path.join(frames_root, name) for name in frame_names]
     
     print(f"Found {len(frame_files)} frame files")
-    print(f"First frame: {os.path.basename(frame_files[0])}")
-    print(f"Last frame: {os.path.basename(frame_files[-1])}")
+    print(f"First frame: {frame_names[0]}")
+    print(f"Last frame: {frame_names[-1]}")
     print()
     
     # Read the first frame to get dimensions
-    first_frame = cv2.imread(frame_files[0])
+    first_frame = load_frame(frame_files[0])
     if first_frame is None:
         raise ValueError(f"Could not read first frame: {frame_files[0]}")
     
@@ -254,41 +969,21 @@ def frames_to_video(frames_dir, output_video, fps=25.0, frame_pattern="frame_*.j
     output_path = Path(output_video)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Initialize video writer
-    fourcc = cv2.VideoWriter_fourcc(*codec)
-    out = cv2.VideoWriter(output_video, fourcc, fps, (width, height))
-    
-    if not out.isOpened():
-        raise ValueError(f"Could not initialize video writer with codec '{codec}'")
-    
-    print("Converting frames to video...")
-    
-    # Process each frame
-    processed_count = 0
+    ffmpeg = shutil.which('ffmpeg')
     
-    for i, frame_file in enumerate(frame_files):
-        # Read frame
-        frame = cv2.imread(frame_file)
-        
-        if frame is None:
-            print(f"⚠️  Warning: Could not read frame {frame_file}, skipping")
-            continue
-        
-        # Check if frame dimensions match
-        if frame.shape[:2] != (height, width):
-            print(f"⚠️  Warning: Frame {frame_file} has different dimensions, resizing")
-            frame = cv2.resize(frame, (width, height))
-        
-        # Write frame to video
-        out.write(frame)
-        processed_count += 1
-        
-        # Progress indicator
-        if processed_count % 10 == 0 or processed_count <= 10:
-            print(f"Processed frame {processed_count}/{len(frame_files)}: {os.path.basename(frame_file)}")
+    if codec == 'MJPG' and output_path.suffix.lower() == '.avi' and is_jpeg_sequence(frame_files):
+        print("Copying JPEG frames into MJPG video...")
+        processed_count = compose_mjpg_passthrough(frame_files, output_video, fps, width, height, read_bytes)
+    elif ffmpeg:
+        print("Converting frames to video with ffmpeg...")
+        processed_count = _compose_with_ffmpeg(ffmpeg, frame_files, output_video, fps, codec, width, height,
+                                               read_bytes)
+    else:
+        print("Converting frames to video...")
+        processed_count = _compose_with_opencv(frame_files, output_video, fps, codec, width, height,
+                                               load_frame)
     
-    # Clean up
-    out.release()
+    flush_progress()
     
     print(f"\nVideo creation complete!")
     print(f"Processed {processed_count} frames")
@@ -335,6 +1030,10 @@ Especially useful for:
   %(prog)s esp32_video.avi frames/ --quiet
   # (Handles corrupted ESP32 AVI files gracefully)
 
+🔸 HIGH FRAME COUNT EXTRACTION:
+  %(prog)s long_video.avi frames/ --tar
+  %(prog)s frames.tar output.mp4 --compose --fps 25
+
 🔸 BASIC FRAMES TO VIDEO COMPOSITION:
   %(prog)s frames/ output.mp4 --compose --fps 30
   %(prog)s images/ timelapse.mp4 --compose --fps 60
@@ -377,6 +1076,8 @@ Especially useful for:
 • For time-lapse: Increase FPS (30-60) for smooth motion
 • For slow motion: Decrease FPS (5-15) for slow playback
 • Use --quiet flag for batch processing scripts
+• Install ffmpeg for faster composition
+• MJPG output to .avi from JPEG frames copies the frames without re-encoding
 
 🔧 CODEC COMPATIBILITY:
 • mp4v: Best compatibility, larger files
@@ -402,7 +1103,8 @@ Especially useful for:
         'input',
         help='''Input path:
         • EXTRACTION mode: Path to video file (e.g., video.avi, recording.mp4)
-        • COMPOSITION mode: Directory containing frame images (e.g., frames/, images/)'''
+        • COMPOSITION mode: Directory containing frame images (e.g., frames/, images/)
+          or a tar archive written with --tar (e.g., frames.tar)'''
     )
     
     parser.add_argument(
@@ -466,6 +1168,43 @@ Especially useful for:
         • --step 30: Every 30th frame (good for long videos)'''
     )
     
+    extraction_group.add_argument(
+        '--quality',
+        type=int,
+        default=95,
+        help='''Encoding quality for jpg/webp frames (1-100, default: 95)
+        Lower values give smaller files; ignored for lossless formats'''
+    )
+    
+    extraction_group.add_argument(
+        '--hwaccel',
+        default='any',
+        choices=list(HWACCEL_TYPES),
+        help='''Hardware video decoding (default: any)
+        • any: Use any available GPU decoder, else software
+        • vaapi/d3d11/mfx: Request a specific decoder API
+        • none: Always decode in software'''
+    )
+    
+    extraction_group.add_argument(
+        '--processes',
+        type=int,
+        default=0,
+        help='''Encode and write frames in N worker processes (default: 0)
+        • 0: Use writer threads in this process
+        • N: Use N processes sharing decoded frames via shared memory
+        Useful on many-core machines'''
+    )
+    
+    extraction_group.add_argument(
+        '--tar',
+        action='store_true',
+        help='''Append frames to a single uncompressed archive <output>.tar
+        instead of writing one file per frame
+        Much faster for high frame counts and network filesystems;
+        compose straight from the archive with --compose frames.tar'''
+    )
+    
     # Video composition arguments
     composition_group = parser.add_argument_group('📥 Video Composition Options', 
                                                  'Used when composing frame images INTO video files')
@@ -524,12 +1263,14 @@ Especially useful for:
     # Parse arguments
     args = parser.parse_args()
     
+    configure_logging(args.quiet)
+    
     try:
         if args.compose:
             # Composition mode: frames directory to video file
             
-            # Validate input directory
-            if not os.path.isdir(args.input):
+            # Validate input directory (or frames archive)
+            if not os.path.isdir(args.input) and not (os.path.isfile(args.input) and tarfile.is_tarfile(args.input)):
                 print(f"Error: Input frames directory '{args.input}' does not exist")
                 sys.exit(1)
             
@@ -567,6 +1308,20 @@ Especially useful for:
                 print("Error: Step must be >= 1")
                 sys.exit(1)
             
+            # Validate quality
+            if not 1 <= args.quality <= 100:
+                print("Error: Quality must be between 1 and 100")
+                sys.exit(1)
+            
+            # Validate processes
+            if args.processes < 0:
+                print("Error: Processes must be >= 0")
+                sys.exit(1)
+            
+            if args.tar and args.processes > 0:
+                print("Error: --tar cannot be combined with --processes")
+                sys.exit(1)
+            
             # Validate video file first
             if not args.quiet:
                 print(f"Validating video file '{args.input}'...")
@@ -593,7 +1348,11 @@ Especially useful for:
                 image_format=args.format,
                 start_frame=args.start,
                 end_frame=args.end,
-                step=args.step
+                step=args.step,
+                quality=args.quality,
+                hwaccel=args.hwaccel,
+                processes=args.processes,
+                tar=args.tar
             )
             
             if not args.quiet:
@@ -6,62 +6,388 @@ This script tests all the API endpoints of the ESP32 edge monitor device
 and measures response times for performance analysis.
 
 Usage:
-    python3 test_edge_monitor_api.py [device_ip] [port]
+    python3 test_edge_monitor_api.py [device_ip] [port] [--yes-clear-sd]
+                                     [--iterations N] [--server-url URL]
     
 Example:
     python3 test_edge_monitor_api.py 192.168.1.52 80
+    python3 test_edge_monitor_api.py 192.168.1.52 80 --yes-clear-sd --iterations 10
 """
 
+import argparse
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import logging
+import logging.handlers
 import time
 import sys
 import os
+import socket
 import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Any, Optional, Tuple, List
 
+# Maximum number of requests in flight at once for read-only endpoints
+MAX_CONCURRENT_REQUESTS = 4
+
+# Web server that proxies the device and stores uploaded files
+SERVER_URL = "http://localhost:8000"
+
+# Default (connect, read) timeout: a LAN connect takes milliseconds, so fail
+# fast on a dead device, but allow long reads for the ESP32
+REQUEST_TIMEOUT = (0.5, 30)
+
+# Timeout (seconds) for the raw TCP probe run before any HTTP request
+CONNECT_PROBE_TIMEOUT = 0.25
+
+# Start-of-image marker every JPEG begins with
+JPEG_SOI = b'\xff\xd8\xff'
+
+# JPEG does not compress, so ask the device not to gzip captures
+CAPTURE_HEADERS = {'Accept-Encoding': 'identity'}
+
+# A p99 above this multiple of p50 is reported as latency jitter
+JITTER_RATIO = 3.0
+
+# How long (seconds) a GET response may be reused by informational re-reads
+RESPONSE_CACHE_TTL = 2.0
+
+# Camera settings exercised by the /control test
+CONTROL_SETTINGS = [
+    {"var": "quality", "val": 10},
+    {"var": "brightness", "val": 1},
+    {"var": "contrast", "val": 0},
+    {"var": "saturation", "val": -1},
+    {"var": "framesize", "val": 1}  # QVGA
+]
+
+# Safe commands exercised by the /command test (no restart or clear_sd)
+TEST_COMMANDS = [
+    {"command": "start"},
+    {"command": "stop"},
+    {"command": "pause"},
+    {"command": "photo"},
+    {"command": "list_files"},
+    {"command": "test_sd"}
+]
+
+# Recording settings exercised by the /recording-config test
+RECORDING_CONFIGS = [
+    {"setting": "interval", "value": 30},
+    {"setting": "duration", "value": 15},
+    {"setting": "stream_interval", "value": 5}
+]
+
+# Bulk update sent to /apply-settings
+BULK_SETTINGS = {
+    "framesize": 1,  # QVGA
+    "quality": 15,
+    "brightness": 0,
+    "contrast": 1,
+    "saturation": 0,
+    "capture_interval": 60,
+    "capture_duration": 10,
+    "stream_interval": 5
+}
+
+# Request bodies are fixed, so encode them once rather than on every POST
+CONTROL_BODIES = [json.dumps(setting).encode() for setting in CONTROL_SETTINGS]
+COMMAND_BODIES = [json.dumps(cmd).encode() for cmd in TEST_COMMANDS]
+RECORDING_CONFIG_BODIES = [json.dumps(config).encode() for config in RECORDING_CONFIGS]
+BULK_SETTINGS_BODY = json.dumps(BULK_SETTINGS).encode()
+LIST_FILES_BODY = json.dumps({"command": "list_files"}).encode()
+DEVICE_PROBES_BODY = json.dumps({"ops": [
+    {"method": "GET", "path": "/files"},
+    {"method": "GET", "path": "/status"}
+]}).encode()
+CLEAR_SD_BODY = json.dumps({"command": "clear_sd"}).encode()
+
+logger = logging.getLogger("edge_monitor_tester")
+
+def configure_logging():
+    """
+    Buffer log records and write them to stdout in batches, so console I/O
+    does not land inside the timed requests. Errors flush immediately.
+    """
+    if logger.handlers:
+        return
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s", datefmt="%H:%M:%S"))
+    logger.addHandler(logging.handlers.MemoryHandler(
+        capacity=256,
+        flushLevel=logging.ERROR,
+        target=console
+    ))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+def flush_log():
+    """Write out any buffered log records"""
+    for handler in logger.handlers:
+        handler.flush()
+
 class EdgeMonitorAPITester:
-    def __init__(self, device_ip: str = "192.168.1.52", port: int = 80):
+    # Monotonic nanosecond clock for request timing; unaffected by NTP slews
+    _now = staticmethod(time.perf_counter_ns)
+    
+    def __init__(self, device_ip: str = "192.168.1.52", port: int = 80, server_url: str = SERVER_URL,
+                 allow_clear_sd: bool = False, iterations: int = 3):
         self.device_ip = device_ip
         self.port = port
+        self.allow_clear_sd = allow_clear_sd  # Run clear_sd without asking
+        self.iterations = iterations  # Samples per repeated endpoint test
         self.base_url = f"http://{device_ip}:{port}"
+        self.status_url = f"{self.base_url}/status"
+        self.capture_url = f"{self.base_url}/capture"
+        self.control_url = f"{self.base_url}/control"
+        self.files_url = f"{self.base_url}/files"
+        self.command_url = f"{self.base_url}/command"
+        self.recording_config_url = f"{self.base_url}/recording-config"
+        self.apply_settings_url = f"{self.base_url}/apply-settings"
+        self.batch_url = f"{self.base_url}/batch"
+        self.supports_batch = False  # Set once /status advertises POST /batch
+        self.server_url = server_url.rstrip('/')
+        self.server_files_url = f"{self.server_url}/api/files"
+        self.server_device_files_url = f"{self.server_url}/api/device/files"
         self.session = requests.Session()
-        self.session.timeout = 30  # Increased timeout for ESP32
+        # Keep connections to the device alive and pooled
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+        )
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "Connection": "keep-alive",
+            "Content-Type": "application/json"
+        })
+        # The web server gets its own pool: its connections are not competing
+        # with the device's, and its 503 "no device" replies are meaningful
+        # rather than something to retry
+        self.server_session = requests.Session()
+        self.server_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=MAX_CONCURRENT_REQUESTS))
+        self.server_session.headers.update({"Connection": "keep-alive"})
         self.timing_results = {}  # Store timing data for analysis
+        self._timing_lock = threading.Lock()
+        self._local = threading.local()  # Per-thread log buffer
+        self._response_cache = {}  # url -> (fetched_ns, response)
+        configure_logging()
+    
+    def close(self):
+        """Close the pooled device and server connections"""
+        self.session.close()
+        self.server_session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+        
+    def _emit(self, level: str, message: str, *args):
+        """Log a record, or hold it back if this thread is buffering its output"""
+        levelno = getattr(logging, level, logging.INFO)
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is not None:
+            buffer.append(logger.makeRecord(logger.name, levelno, __file__, 0, message, args, None))
+        else:
+            logger.log(levelno, message, *args)
         
     def log(self, message: str, level: str = "INFO"):
         """Log a message with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] {level}: {message}")
+        self._emit(level, "%s", message)
         
     def log_with_timing(self, message: str, duration: float, level: str = "INFO"):
         """Log a message with timing information"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        print(f"[{timestamp}] {level}: {message} ({duration:.3f}s)")
-        
-    def make_timed_request(self, method: str, url: str, **kwargs) -> Tuple[Optional[requests.Response], float]:
-        """Make a request and measure its duration"""
-        start_time = time.time()
+        self._emit(level, "%s (%.3fs)", message, duration)
+    
+    def record_timing(self, endpoint: str, data: Dict[str, Any]):
+        """
+        Store timing data for an endpoint (safe to call from worker threads).
+        
+        Ignored for tests run with timed=False: their requests competed with
+        others for the device, so the numbers would be queueing time.
+        """
+        if not getattr(self._local, 'timed', True):
+            return
+        with self._timing_lock:
+            self.timing_results[endpoint] = data
+    
+    def _run_buffered(self, test_fn, timed: bool = True):
+        """Run a test function, collecting its log records instead of emitting them"""
+        self._local.buffer = []
+        self._local.timed = timed
         try:
-            if method.upper() == 'GET':
-                response = self.session.get(url, **kwargs)
-            elif method.upper() == 'POST':
-                response = self.session.post(url, **kwargs)
+            return test_fn(), self._local.buffer
+        finally:
+            self._local.buffer = None
+            self._local.timed = True
+    
+    def _run_in_parallel(self, test_fns) -> List[Tuple[Any, List[logging.LogRecord]]]:
+        """
+        Run test functions concurrently; return each one's (result, log records) in order.
+        
+        Only for pass/fail checks: their timings aren't recorded.
+        """
+        with ThreadPoolExecutor(max_workers=len(test_fns)) as executor:
+            futures = [executor.submit(self._run_buffered, test_fn, False) for test_fn in test_fns]
+        return [future.result() for future in futures]
+        
+    @staticmethod
+    def _summary(durations: List[float]) -> Tuple[float, float, float]:
+        """Return (avg, min, max) of a non-empty list of durations in one pass"""
+        total = lo = hi = durations[0]
+        for d in durations[1:]:
+            total += d
+            if d < lo:
+                lo = d
+            elif d > hi:
+                hi = d
+        return total / len(durations), lo, hi
+    
+    def wait_ready(self, max_wait: float, poll_interval: float = 0.05):
+        """
+        Wait until the device looks idle again, for at most max_wait seconds.
+        
+        Polls /status until it reports busy=false. Current firmware has no
+        busy flag, so otherwise it waits for two consecutive responses whose
+        free_heap agrees within 5%, meaning the last command has settled.
+        """
+        deadline_ns = self._now() + int(max_wait * 1e9)
+        last_heap = None
+        while self._now() < deadline_ns:
+            response, _ = self.make_timed_request('GET', self.status_url, timeout=1)
+            try:
+                data = self._json(response) if response and response.status_code == 200 else None
+            except ValueError:
+                data = None
+            if data is not None:
+                if 'busy' in data:
+                    if not data['busy']:
+                        return
+                else:
+                    heap = data.get('free_heap', 0)
+                    if last_heap is not None and abs(heap - last_heap) <= 0.05 * last_heap:
+                        return
+                    last_heap = heap
             else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            duration = time.time() - start_time
+                last_heap = None
+            time.sleep(poll_interval)
+    
+    @staticmethod
+    def _percentiles(durations: List[float]) -> Tuple[float, float, float]:
+        """Return (p50, p95, p99) of a non-empty list of durations"""
+        if len(durations) < 2:
+            return durations[0], durations[0], durations[0]
+        cuts = statistics.quantiles(durations, n=100, method='inclusive')
+        return cuts[49], cuts[94], cuts[98]
+    
+    def record_durations(self, endpoint: str, label: str, durations: List[float], reprobe=None):
+        """
+        Log and store avg/min/max and p50/p95/p99 for an endpoint's durations.
+        
+        ESP32 WiFi latency has long single-packet spikes, so when p99 is more
+        than JITTER_RATIO times p50 the request is repeated once via reprobe()
+        on the warm connection. A fast repeat points at WiFi power-save jitter
+        rather than a slow device.
+        """
+        avg_duration, min_duration, max_duration = self._summary(durations)
+        p50, p95, p99 = self._percentiles(durations)
+        self.log(f"   📊 {label} timing: avg={avg_duration:.3f}s, min={min_duration:.3f}s, max={max_duration:.3f}s, p50={p50:.3f}s, p99={p99:.3f}s")
+        stats = {
+            'durations': durations,
+            'avg': avg_duration,
+            'min': min_duration,
+            'max': max_duration,
+            'p50': p50,
+            'p95': p95,
+            'p99': p99
+        }
+        
+        if reprobe and p99 > JITTER_RATIO * p50:
+            response, duration = reprobe()
+            if response is not None:
+                response.close()
+            stats['reprobe'] = duration
+            if response and duration <= JITTER_RATIO * p50:
+                self.log_with_timing(f"   〰️  {label} slow sample did not repeat - likely WiFi power-save jitter", duration)
+            else:
+                self.log_with_timing(f"   ⚠️  {label} still slow on re-probe - device is consistently slow", duration, "WARNING")
+        
+        self.record_timing(endpoint, stats)
+    
+    @staticmethod
+    def _json(response: requests.Response) -> Any:
+        """Decode a JSON response body straight from its bytes"""
+        return json.loads(response.content)
+    
+    def make_timed_request(self, method: str, url: str, cache_ttl: float = 0, read_only: bool = False,
+                           **kwargs) -> Tuple[Optional[requests.Response], float]:
+        """Make a request and measure its duration
+        
+        Successful GET responses are remembered; a GET with cache_ttl > 0
+        reuses one fetched less than cache_ttl seconds ago and reports 0s.
+        Any other method may change device state, so it drops everything
+        remembered unless the caller marks it read_only. Requests to the
+        web server go through its own session.
+        """
+        kwargs.setdefault('timeout', REQUEST_TIMEOUT)
+        start_ns = self._now()
+        is_get = method.upper() == 'GET'
+        if is_get and cache_ttl > 0:
+            cached = self._response_cache.get(url)
+            if cached and start_ns - cached[0] < cache_ttl * 1e9:
+                cached[1].from_cache = True
+                return cached[1], 0.0
+        session = self.server_session if url.startswith(self.server_url) else self.session
+        if not is_get and not read_only:
+            self._response_cache.clear()
+        try:
+            response = session.request(method, url, **kwargs)
+            duration = (self._now() - start_ns) / 1e9
+            if is_get and response.status_code == 200 and not kwargs.get('stream'):
+                self._response_cache[url] = (start_ns, response)
             return response, duration
         except requests.exceptions.RequestException as e:
-            duration = time.time() - start_time
+            duration = (self._now() - start_ns) / 1e9
             self.log(f"Request failed after {duration:.3f}s: {e}", "ERROR")
             return None, duration
         
+    def warm_up(self):
+        """
+        Open the keep-alive connections the tests will use before timing them,
+        so no endpoint's first sample includes a TCP handshake. The timed
+        tests run one request at a time, so the device and the server each
+        get a single connection: the device only has a few socket slots, and
+        idle extra connections would only take them from the server's own
+        device connections. Failures are ignored.
+        """
+        for session, url in ((self.session, f"{self.base_url}/"), (self.server_session, f"{self.server_url}/")):
+            try:
+                session.get(url, timeout=2).close()
+            except requests.exceptions.RequestException:
+                pass
+    
     def test_connectivity(self) -> Tuple[bool, float]:
         """Test basic connectivity to the device"""
+        self.log(f"Testing connectivity to {self.base_url}")
+        
+        # A bare TCP connect answers "is anything there?" in well under a
+        # second, instead of waiting out the HTTP timeout on a dead device
+        start_ns = self._now()
+        try:
+            socket.create_connection((self.device_ip, self.port), timeout=CONNECT_PROBE_TIMEOUT).close()
+        except OSError as e:
+            self.log_with_timing(f"❌ Cannot open TCP connection to {self.device_ip}:{self.port}: {e}",
+                                 (self._now() - start_ns) / 1e9, "ERROR")
+            return False, 0.0
+        self.log(f"   TCP connect: {(self._now() - start_ns) / 1e6:.2f} ms")
+        
         try:
-            self.log(f"Testing connectivity to {self.base_url}")
             response, duration = self.make_timed_request('GET', f"{self.base_url}/", timeout=5)
             
             if response and response.status_code == 200:
@@ -79,14 +405,21 @@ class EdgeMonitorAPITester:
         """Test the /status endpoint with timing analysis"""
         self.log(f"Testing /status endpoint ({iterations} iterations)...")
         durations = []
+        data = None
         
-        for i in range(iterations):
+        # Requests go one at a time: the firmware's HTTP server handles them
+        # on a single task, so concurrent ones would time the queue behind
+        # each other rather than the endpoint
+        url = self.status_url
+        results = [self.make_timed_request('GET', url) for _ in range(iterations)]
+        
+        for i, (response, duration) in enumerate(results):
             try:
-                response, duration = self.make_timed_request('GET', f"{self.base_url}/status")
                 durations.append(duration)
                 
                 if response and response.status_code == 200:
-                    data = response.json()
+                    data = self._json(response)
+                    self.supports_batch = bool(data.get('batch', False))
                     if i == 0:  # Only log details for first iteration
                         self.log_with_timing("✅ Status endpoint working", duration)
                         self.log(f"   Device Type: {data.get('device_type', 'Unknown')}")
@@ -103,8 +436,6 @@ class EdgeMonitorAPITester:
                     status_code = response.status_code if response else "No response"
                     self.log_with_timing(f"❌ Status endpoint failed: {status_code}", duration, "ERROR")
                     return None, durations
-                    
-                time.sleep(0.5)  # Brief pause between requests
                 
             except Exception as e:
                 self.log_with_timing(f"❌ Status endpoint error: {e}", duration, "ERROR")
@@ -112,18 +443,10 @@ class EdgeMonitorAPITester:
         
         # Calculate timing statistics
         if durations:
-            avg_duration = statistics.mean(durations)
-            min_duration = min(durations)
-            max_duration = max(durations)
-            self.log(f"   📊 Status timing: avg={avg_duration:.3f}s, min={min_duration:.3f}s, max={max_duration:.3f}s")
-            self.timing_results['status'] = {
-                'durations': durations,
-                'avg': avg_duration,
-                'min': min_duration,
-                'max': max_duration
-            }
-        
-        return data if 'data' in locals() else None, durations
+            self.record_durations('status', "Status", durations,
+                                  reprobe=lambda: self.make_timed_request('GET', self.status_url))
+        
+        return data, durations
     
     def test_capture_endpoint(self, iterations: int = 3) -> Tuple[bool, List[float]]:
         """Test the /capture endpoint with timing analysis"""
@@ -133,37 +456,44 @@ class EdgeMonitorAPITester:
         
         for i in range(iterations):
             try:
-                response, duration = self.make_timed_request('GET', f"{self.base_url}/capture")
-                durations.append(duration)
+                # Stream the JPEG and only count its bytes
+                response, duration = self.make_timed_request(
+                    'GET',
+                    self.capture_url,
+                    stream=True,
+                    headers=CAPTURE_HEADERS
+                )
                 
                 if response and response.status_code == 200:
-                    content_type = response.headers.get('content-type', '')
-                    if 'image/jpeg' in content_type:
-                        self.log_with_timing(f"   ✅ Image {i+1}: {len(response.content)} bytes", duration)
+                    # Check the JPEG signature on the first chunk so a bad
+                    # response is dropped before the rest of it is read
+                    start_ns = self._now()
+                    chunks = response.iter_content(chunk_size=16384)
+                    first = next(chunks, b'')
+                    if first.startswith(JPEG_SOI):
+                        size = len(first) + sum(len(chunk) for chunk in chunks)
+                        duration += (self._now() - start_ns) / 1e9
+                        self.log_with_timing(f"   ✅ Image {i+1}: {size} bytes", duration)
                         success_count += 1
                     else:
-                        self.log_with_timing(f"   ❌ Image {i+1} wrong content type: {content_type}", duration, "ERROR")
+                        duration += (self._now() - start_ns) / 1e9
+                        content_type = response.headers.get('content-type', '')
+                        self.log_with_timing(f"   ❌ Image {i+1} is not a JPEG (content type: {content_type})", duration, "ERROR")
                 else:
                     status_code = response.status_code if response else "No response"
                     self.log_with_timing(f"   ❌ Image {i+1} failed: {status_code}", duration, "ERROR")
                 
-                time.sleep(1)  # Wait between captures
+                if response is not None:
+                    response.close()
+                durations.append(duration)
                 
             except Exception as e:
                 self.log_with_timing(f"   ❌ Image {i+1} error: {e}", duration, "ERROR")
         
         # Calculate timing statistics
         if durations:
-            avg_duration = statistics.mean(durations)
-            min_duration = min(durations)
-            max_duration = max(durations)
-            self.log(f"   📊 Capture timing: avg={avg_duration:.3f}s, min={min_duration:.3f}s, max={max_duration:.3f}s")
-            self.timing_results['capture'] = {
-                'durations': durations,
-                'avg': avg_duration,
-                'min': min_duration,
-                'max': max_duration
-            }
+            self.record_durations('capture', "Capture", durations,
+                                  reprobe=lambda: self.make_timed_request('GET', self.capture_url))
         
         success = success_count == iterations
         if success:
@@ -177,31 +507,21 @@ class EdgeMonitorAPITester:
         """Test the /control endpoint with various camera settings and timing"""
         self.log("Testing /control endpoint...")
         
-        # Test different camera settings
-        test_settings = [
-            {"var": "quality", "val": 10},
-            {"var": "brightness", "val": 1},
-            {"var": "contrast", "val": 0},
-            {"var": "saturation", "val": -1},
-            {"var": "framesize", "val": 1}  # QVGA
-        ]
-        
         durations = []
         success_count = 0
         
-        for setting in test_settings:
+        for setting, body in zip(CONTROL_SETTINGS, CONTROL_BODIES):
             try:
                 self.log(f"   Testing {setting['var']} = {setting['val']}")
                 response, duration = self.make_timed_request(
                     'POST', 
-                    f"{self.base_url}/control",
-                    json=setting,
-                    headers={'Content-Type': 'application/json'}
+                    self.control_url,
+                    data=body
                 )
                 durations.append(duration)
                 
                 if response and response.status_code == 200:
-                    data = response.json()
+                    data = self._json(response)
                     if data.get('success', False):
                         self.log_with_timing(f"   ✅ {setting['var']} updated successfully", duration)
                         success_count += 1
@@ -211,41 +531,40 @@ class EdgeMonitorAPITester:
                     status_code = response.status_code if response else "No response"
                     self.log_with_timing(f"   ❌ {setting['var']} request failed: {status_code}", duration, "ERROR")
                     
-                time.sleep(1)  # Give device time to process
+                self.wait_ready(1)  # Give device time to process
                 
             except Exception as e:
                 self.log_with_timing(f"   ❌ {setting['var']} error: {e}", duration, "ERROR")
         
         # Calculate timing statistics
         if durations:
-            avg_duration = statistics.mean(durations)
-            min_duration = min(durations)
-            max_duration = max(durations)
-            self.log(f"   📊 Control timing: avg={avg_duration:.3f}s, min={min_duration:.3f}s, max={max_duration:.3f}s")
-            self.timing_results['control'] = {
-                'durations': durations,
-                'avg': avg_duration,
-                'min': min_duration,
-                'max': max_duration
-            }
-        
-        success = success_count == len(test_settings)
+            self.record_durations('control', "Control", durations)
+        
+        success = success_count == len(CONTROL_SETTINGS)
         if success:
             self.log("✅ All control settings updated successfully")
         else:
-            self.log(f"❌ Only {success_count}/{len(test_settings)} control settings succeeded", "ERROR")
+            self.log(f"❌ Only {success_count}/{len(CONTROL_SETTINGS)} control settings succeeded", "ERROR")
         
         return success, durations
     
-    def test_files_endpoint(self) -> Tuple[Optional[Dict[str, Any]], float]:
-        """Test the /files endpoint"""
-        self.log("Testing /files endpoint...")
+    def test_files_endpoint(self, batched: Optional[Tuple[int, Any, float]] = None) -> Tuple[Optional[Dict[str, Any]], float]:
+        """Test the /files endpoint
+        
+        batched is a (status_code, body, duration) result already fetched
+        through /batch; without it /files is requested directly.
+        """
+        self.log("Testing /files endpoint..." if batched is None else "Checking /files result from /batch...")
         
         try:
-            response, duration = self.make_timed_request('GET', f"{self.base_url}/files")
+            if batched is None:
+                response, duration = self.make_timed_request('GET', self.files_url)
+                status_code = response.status_code if response else "No response"
+                data = self._json(response) if status_code == 200 else None
+            else:
+                status_code, data, duration = batched
             
-            if response and response.status_code == 200:
-                data = response.json()
+            if status_code == 200:
                 self.log_with_timing(f"✅ Files endpoint working", duration)
                 self.log(f"   Total files: {data.get('total_files', 0)}")
                 self.log(f"   Upload queue: {data.get('upload_queue_size', 0)}")
@@ -260,10 +579,10 @@ class EdgeMonitorAPITester:
                 else:
                     self.log("   ⚠️  No files found on SD card")
                 
-                self.timing_results['files'] = {'duration': duration}
+                if batched is None:
+                    self.record_timing('files', {'duration': duration})
                 return data, duration
             else:
-                status_code = response.status_code if response else "No response"
                 self.log_with_timing(f"❌ Files endpoint failed: {status_code}", duration, "ERROR")
                 return None, duration
         except Exception as e:
@@ -274,32 +593,21 @@ class EdgeMonitorAPITester:
         """Test the /command endpoint with various commands and timing"""
         self.log("Testing /command endpoint...")
         
-        # Test safe commands (avoid restart and clear_sd for now)
-        test_commands = [
-            {"command": "start"},
-            {"command": "stop"},
-            {"command": "pause"},
-            {"command": "photo"},
-            {"command": "list_files"},
-            {"command": "test_sd"}
-        ]
-        
         durations = []
         success_count = 0
         
-        for cmd in test_commands:
+        for cmd, body in zip(TEST_COMMANDS, COMMAND_BODIES):
             try:
                 self.log(f"   Testing command: {cmd['command']}")
                 response, duration = self.make_timed_request(
                     'POST', 
-                    f"{self.base_url}/command",
-                    json=cmd,
-                    headers={'Content-Type': 'application/json'}
+                    self.command_url,
+                    data=body
                 )
                 durations.append(duration)
                 
                 if response and response.status_code == 200:
-                    data = response.json()
+                    data = self._json(response)
                     if data.get('success', False):
                         self.log_with_timing(f"   ✅ Command '{cmd['command']}' executed: {data.get('message', '')}", duration)
                         success_count += 1
@@ -309,29 +617,20 @@ class EdgeMonitorAPITester:
                     status_code = response.status_code if response else "No response"
                     self.log_with_timing(f"   ❌ Command '{cmd['command']}' request failed: {status_code}", duration, "ERROR")
                     
-                time.sleep(2)  # Give device time to process
+                self.wait_ready(2)  # Give device time to process
                 
             except Exception as e:
                 self.log_with_timing(f"   ❌ Command '{cmd['command']}' error: {e}", duration, "ERROR")
         
         # Calculate timing statistics
         if durations:
-            avg_duration = statistics.mean(durations)
-            min_duration = min(durations)
-            max_duration = max(durations)
-            self.log(f"   📊 Command timing: avg={avg_duration:.3f}s, min={min_duration:.3f}s, max={max_duration:.3f}s")
-            self.timing_results['command'] = {
-                'durations': durations,
-                'avg': avg_duration,
-                'min': min_duration,
-                'max': max_duration
-            }
-        
-        success = success_count == len(test_commands)
+            self.record_durations('command', "Command", durations)
+        
+        success = success_count == len(TEST_COMMANDS)
         if success:
             self.log("✅ All commands executed successfully")
         else:
-            self.log(f"❌ Only {success_count}/{len(test_commands)} commands succeeded", "ERROR")
+            self.log(f"❌ Only {success_count}/{len(TEST_COMMANDS)} commands succeeded", "ERROR")
         
         return success, durations
     
@@ -339,28 +638,21 @@ class EdgeMonitorAPITester:
         """Test the /recording-config endpoint with timing"""
         self.log("Testing /recording-config endpoint...")
         
-        test_configs = [
-            {"setting": "interval", "value": 30},
-            {"setting": "duration", "value": 15},
-            {"setting": "stream_interval", "value": 5}
-        ]
-        
         durations = []
         success_count = 0
         
-        for config in test_configs:
+        for config, body in zip(RECORDING_CONFIGS, RECORDING_CONFIG_BODIES):
             try:
                 self.log(f"   Testing {config['setting']} = {config['value']} seconds")
                 response, duration = self.make_timed_request(
                     'POST', 
-                    f"{self.base_url}/recording-config",
-                    json=config,
-                    headers={'Content-Type': 'application/json'}
+                    self.recording_config_url,
+                    data=body
                 )
                 durations.append(duration)
                 
                 if response and response.status_code == 200:
-                    data = response.json()
+                    data = self._json(response)
                     if data.get('success', False):
                         self.log_with_timing(f"   ✅ {config['setting']} updated successfully", duration)
                         success_count += 1
@@ -370,29 +662,20 @@ class EdgeMonitorAPITester:
                     status_code = response.status_code if response else "No response"
                     self.log_with_timing(f"   ❌ {config['setting']} request failed: {status_code}", duration, "ERROR")
                     
-                time.sleep(1)
+                self.wait_ready(1)
                 
             except Exception as e:
                 self.log_with_timing(f"   ❌ {config['setting']} error: {e}", duration, "ERROR")
         
         # Calculate timing statistics
         if durations:
-            avg_duration = statistics.mean(durations)
-            min_duration = min(durations)
-            max_duration = max(durations)
-            self.log(f"   📊 Recording config timing: avg={avg_duration:.3f}s, min={min_duration:.3f}s, max={max_duration:.3f}s")
-            self.timing_results['recording_config'] = {
-                'durations': durations,
-                'avg': avg_duration,
-                'min': min_duration,
-                'max': max_duration
-            }
-        
-        success = success_count == len(test_configs)
+            self.record_durations('recording_config', "Recording config", durations)
+        
+        success = success_count == len(RECORDING_CONFIGS)
         if success:
             self.log("✅ All recording configs updated successfully")
         else:
-            self.log(f"❌ Only {success_count}/{len(test_configs)} recording configs succeeded", "ERROR")
+            self.log(f"❌ Only {success_count}/{len(RECORDING_CONFIGS)} recording configs succeeded", "ERROR")
         
         return success, durations
     
@@ -401,30 +684,17 @@ class EdgeMonitorAPITester:
         try:
             self.log("Testing /apply-settings endpoint...")
             
-            # Test bulk settings update
-            bulk_settings = {
-                "framesize": 1,  # QVGA
-                "quality": 15,
-                "brightness": 0,
-                "contrast": 1,
-                "saturation": 0,
-                "capture_interval": 60,
-                "capture_duration": 10,
-                "stream_interval": 5
-            }
-            
             response, duration = self.make_timed_request(
                 'POST', 
-                f"{self.base_url}/apply-settings",
-                json=bulk_settings,
-                headers={'Content-Type': 'application/json'}
+                self.apply_settings_url,
+                data=BULK_SETTINGS_BODY
             )
             
             if response and response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 if data.get('success', False):
                     self.log_with_timing("✅ Bulk settings applied successfully", duration)
-                    self.timing_results['apply_settings'] = {'duration': duration}
+                    self.record_timing('apply_settings', {'duration': duration})
                     return True, duration
                 else:
                     self.log_with_timing(f"❌ Bulk settings failed: {data.get('message', 'Unknown error')}", duration, "ERROR")
@@ -443,84 +713,95 @@ class EdgeMonitorAPITester:
         self.log("=" * 80)
         self.log("TIMING ANALYSIS SUMMARY")
         self.log("=" * 80)
+        self.log("All endpoint timings after 'connectivity' reuse one warm keep-alive connection per host")
         
         if not self.timing_results:
             self.log("No timing data available")
             return
         
-        # Sort endpoints by average response time
+        # Sort endpoints by average response time, extracting each average once
         sorted_endpoints = sorted(
-            self.timing_results.items(),
-            key=lambda x: x[1].get('avg', x[1].get('duration', 0))
+            (data['avg'] if 'avg' in data else data.get('duration', 0), endpoint, data)
+            for endpoint, data in self.timing_results.items()
         )
         
-        self.log(f"{'Endpoint':<20} {'Avg (s)':<10} {'Min (s)':<10} {'Max (s)':<10} {'Status'}")
+        self.log(f"{'Endpoint':<20} {'Avg (s)':<10} {'Min (s)':<10} {'Max (s)':<10} {'p99 (s)':<10} {'p99/p50':<8} {'Status'}")
         self.log("-" * 80)
         
-        for endpoint, data in sorted_endpoints:
+        for avg_time, endpoint, data in sorted_endpoints:
             if 'avg' in data:  # Multiple iterations
-                avg = data['avg']
                 min_time = data['min']
                 max_time = data['max']
-                status = "📊 Multiple samples"
+                p99 = data['p99']
+                ratio = p99 / data['p50'] if data['p50'] else 1.0
+                if ratio > JITTER_RATIO:
+                    status = "〰️  Jitter - likely WiFi power-save"
+                else:
+                    status = "📊 Multiple samples"
             else:  # Single iteration
-                avg = data['duration']
-                min_time = max_time = avg
+                min_time = max_time = p99 = avg_time
+                ratio = 1.0
                 status = "📝 Single sample"
             
-            self.log(f"{endpoint:<20} {avg:<10.3f} {min_time:<10.3f} {max_time:<10.3f} {status}")
+            self.log(f"{endpoint:<20} {avg_time:<10.3f} {min_time:<10.3f} {max_time:<10.3f} {p99:<10.3f} {ratio:<8.1f} {status}")
         
         # Performance analysis
         self.log("-" * 80)
         self.log("PERFORMANCE ANALYSIS:")
         
-        fastest_endpoint = min(sorted_endpoints, key=lambda x: x[1].get('avg', x[1].get('duration', 0)))
-        slowest_endpoint = max(sorted_endpoints, key=lambda x: x[1].get('avg', x[1].get('duration', 0)))
+        fastest_time, fastest_endpoint, _ = sorted_endpoints[0]
+        slowest_time, slowest_endpoint, _ = sorted_endpoints[-1]
         
-        self.log(f"🚀 Fastest endpoint: {fastest_endpoint[0]} ({fastest_endpoint[1].get('avg', fastest_endpoint[1].get('duration', 0)):.3f}s)")
-        self.log(f"🐌 Slowest endpoint: {slowest_endpoint[0]} ({slowest_endpoint[1].get('avg', slowest_endpoint[1].get('duration', 0)):.3f}s)")
+        self.log(f"🚀 Fastest endpoint: {fastest_endpoint} ({fastest_time:.3f}s)")
+        self.log(f"🐌 Slowest endpoint: {slowest_endpoint} ({slowest_time:.3f}s)")
         
         # Performance recommendations
         self.log("-" * 80)
         self.log("RECOMMENDATIONS:")
         
-        for endpoint, data in self.timing_results.items():
-            avg_time = data.get('avg', data.get('duration', 0))
+        for avg_time, endpoint, data in sorted_endpoints:
             if avg_time > 5.0:
                 self.log(f"⚠️  {endpoint}: Very slow ({avg_time:.3f}s) - Consider optimization")
             elif avg_time > 2.0:
                 self.log(f"⚡ {endpoint}: Slow ({avg_time:.3f}s) - Monitor performance")
             else:
                 self.log(f"✅ {endpoint}: Good performance ({avg_time:.3f}s)")
+            if 'p50' in data and data['p99'] > JITTER_RATIO * data['p50']:
+                self.log(f"〰️  {endpoint}: p99 is {data['p99'] / data['p50']:.1f}x p50 - disable WiFi power save on the device (WiFi.setSleep(false) / WIFI_PS_NONE)")
     
     def test_clear_sd_command(self) -> Tuple[bool, float]:
         """Test the clear_sd command (WARNING: Destructive!)"""
         self.log("Testing clear_sd command...")
         self.log("⚠️  WARNING: This will delete all files on SD card!")
         
-        # Ask for confirmation
-        try:
-            user_input = input("   Do you want to proceed? (yes/no): ").strip().lower()
-            if user_input != 'yes':
-                self.log("   Skipped clear_sd test")
-                return True, 0.0  # Consider it passed (user choice)
-        except:
-            self.log("   Skipped clear_sd test (no user input)")
-            return True, 0.0
+        # Ask for confirmation unless --yes-clear-sd was given; never block
+        # an unattended run waiting for input
+        if not self.allow_clear_sd:
+            if not sys.stdin.isatty():
+                self.log("   Skipped clear_sd test (pass --yes-clear-sd to enable)")
+                return True, 0.0
+            flush_log()
+            try:
+                user_input = input("   Do you want to proceed? (yes/no): ").strip().lower()
+                if user_input != 'yes':
+                    self.log("   Skipped clear_sd test")
+                    return True, 0.0  # Consider it passed (user choice)
+            except:
+                self.log("   Skipped clear_sd test (no user input)")
+                return True, 0.0
         
         try:
             response, duration = self.make_timed_request(
                 'POST', 
-                f"{self.base_url}/command",
-                json={"command": "clear_sd"},
-                headers={'Content-Type': 'application/json'}
+                self.command_url,
+                data=CLEAR_SD_BODY
             )
             
             if response and response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 if data.get('success', False):
                     self.log_with_timing(f"✅ SD card cleared: {data.get('message', '')}", duration)
-                    self.timing_results['clear_sd'] = {'duration': duration}
+                    self.record_timing('clear_sd', {'duration': duration})
                     return True, duration
                 else:
                     self.log_with_timing(f"❌ Clear SD failed: {data.get('message', 'Unknown error')}", duration, "ERROR")
@@ -538,10 +819,10 @@ class EdgeMonitorAPITester:
         self.log("Testing server files endpoint...")
         
         try:
-            response, duration = self.make_timed_request('GET', f"http://localhost:8000/api/files")
+            response, duration = self.make_timed_request('GET', self.server_files_url)
             
             if response and response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 self.log_with_timing(f"✅ Server files endpoint working", duration)
                 self.log(f"   📁 Total files: {data.get('total_files', 0)}")
                 self.log(f"   💾 Total size: {data.get('total_size_mb', 0)} MB")
@@ -556,7 +837,7 @@ class EdgeMonitorAPITester:
                 else:
                     self.log("   ⚠️  No files found on server")
                 
-                self.timing_results['server_files'] = {'duration': duration}
+                self.record_timing('server_files', {'duration': duration})
                 return data, duration
             else:
                 status_code = response.status_code if response else "No response"
@@ -571,10 +852,10 @@ class EdgeMonitorAPITester:
         self.log("Testing server proxy to device files...")
         
         try:
-            response, duration = self.make_timed_request('GET', f"http://localhost:8000/api/device/files")
+            response, duration = self.make_timed_request('GET', self.server_device_files_url)
             
             if response and response.status_code == 200:
-                data = response.json()
+                data = self._json(response)
                 self.log_with_timing(f"✅ Server proxy to device works", duration)
                 self.log(f"   📱 Device: {data.get('device_url', 'Unknown')}")
                 self.log(f"   📁 Total files: {data.get('total_files', 0)}")
@@ -590,10 +871,10 @@ class EdgeMonitorAPITester:
                 else:
                     self.log("   ℹ️  No files found on device SD card")
                 
-                self.timing_results['server_device_proxy'] = {'duration': duration}
+                self.record_timing('server_device_proxy', {'duration': duration})
                 return data, duration
             elif response and response.status_code == 503:
-                self.log_with_timing(f"⚠️  No device connected: {response.json().get('detail', 'Unknown')}", duration, "WARNING")
+                self.log_with_timing(f"⚠️  No device connected: {self._json(response).get('detail', 'Unknown')}", duration, "WARNING")
                 return None, duration
             else:
                 status_code = response.status_code if response else "No response"
@@ -603,53 +884,108 @@ class EdgeMonitorAPITester:
             self.log(f"❌ Server proxy error: {e}", "ERROR")
             return None, 0.0
 
-    def test_complete_file_pipeline(self) -> Dict[str, Any]:
-        """Test the complete file management pipeline"""
-        self.log("=" * 70)
-        self.log("COMPLETE FILE MANAGEMENT PIPELINE TEST")
-        self.log("=" * 70)
-        
-        pipeline_results = {}
+    def test_device_status(self, batched: Optional[Tuple[int, Any, float]] = None) -> bool:
+        """Check the device status summary used by the pipeline test
         
-        # Test 1: Server file listing
-        self.log("\n[1] Server Files (via Web API)")
-        self.log("-" * 70)
-        server_data, server_time = self.test_server_files_endpoint()
-        pipeline_results["server_files"] = server_data is not None
-        
-        # Test 2: Device file listing (via server proxy)
-        self.log("\n[2] Device Files (via Server Proxy API)")
-        self.log("-" * 70)
-        proxy_data, proxy_time = self.test_server_device_files_proxy()
-        pipeline_results["server_proxy"] = proxy_data is not None
-        
-        # Test 3: Direct device file listing
-        self.log("\n[3] Device Files (Direct ESP32 API)")
-        self.log("-" * 70)
-        device_data, device_time = self.test_files_endpoint()
-        pipeline_results["direct_device"] = device_data is not None
-        
-        # Test 4: Device status
-        self.log("\n[4] Device Status")
-        self.log("-" * 70)
+        batched is a (status_code, body, duration) result already fetched
+        through /batch; without it /status is requested directly.
+        """
         try:
-            response, duration = self.make_timed_request('GET', f"{self.base_url}/status")
-            if response and response.status_code == 200:
-                data = response.json()
-                self.log_with_timing(f"✅ Device status API works", duration)
+            if batched is None:
+                # Informational only, so a very recent /status response will do
+                response, duration = self.make_timed_request(
+                    'GET',
+                    self.status_url,
+                    cache_ttl=RESPONSE_CACHE_TTL
+                )
+                status_code = response.status_code if response else "No response"
+                data = self._json(response) if status_code == 200 else None
+                cached = " (cached)" if getattr(response, 'from_cache', False) else ""
+            else:
+                status_code, data, duration = batched
+                cached = " (via /batch)"
+            if status_code == 200:
+                self.log_with_timing(f"✅ Device status API works{cached}", duration)
                 self.log(f"   📹 Camera: {'OK' if data.get('camera_ready') else 'FAILED'}")
                 self.log(f"   💾 SD Card: {'OK' if data.get('sd_ready') else 'FAILED'}")
                 self.log(f"   📡 WiFi: {'Connected' if data.get('wifi_connected') else 'Disconnected'}")
                 self.log(f"   🎥 Recording: {'YES' if data.get('is_recording') else 'NO'}")
                 self.log(f"   📁 File count: {data.get('file_count', 0)}")
                 self.log(f"   💾 Storage used: {data.get('storage_used', 0)} MB")
-                pipeline_results["device_status"] = True
+                return True
             else:
-                self.log(f"❌ Device status failed: {response.status_code if response else 'No response'}")
-                pipeline_results["device_status"] = False
+                self.log(f"❌ Device status failed: {status_code}")
+                return False
         except Exception as e:
             self.log(f"❌ Device status error: {e}")
-            pipeline_results["device_status"] = False
+            return False
+
+    def batch_request(self, body: bytes) -> Tuple[Optional[List[Dict[str, Any]]], float]:
+        """
+        POST pre-encoded ops to the device's /batch endpoint, which answers
+        several read-only requests in one round trip. Returns the per-op
+        results ({"path", "status", "body"}) or None if the call failed.
+        """
+        response, duration = self.make_timed_request('POST', self.batch_url, read_only=True, data=body)
+        if response and response.status_code == 200:
+            self.log_with_timing("✅ Fetched device probes through /batch", duration)
+            self.record_timing('batch', {'duration': duration})
+            return self._json(response).get('results'), duration
+        status_code = response.status_code if response else "No response"
+        self.log_with_timing(f"❌ Batch request failed: {status_code}", duration, "ERROR")
+        return None, duration
+
+    def test_complete_file_pipeline(self) -> Dict[str, Any]:
+        """Test the complete file management pipeline"""
+        self.log("=" * 70)
+        self.log("COMPLETE FILE MANAGEMENT PIPELINE TEST")
+        self.log("=" * 70)
+        
+        pipeline_results = {}
+        
+        # Tests 1-4 are independent reads, so run them in parallel and
+        # print each one's output in order once they have all finished.
+        # They only check that each step works; running concurrently against
+        # the device, their durations aren't recorded as endpoint timings
+        steps = [
+            ("server_files", "[1] Server Files (via Web API)",
+             lambda: self.test_server_files_endpoint()[0] is not None),
+            ("server_proxy", "[2] Device Files (via Server Proxy API)",
+             lambda: self.test_server_device_files_proxy()[0] is not None),
+        ]
+        device_steps = [
+            ("direct_device", "[3] Device Files (Direct ESP32 API)",
+             lambda batched=None: self.test_files_endpoint(batched)[0] is not None),
+            ("device_status", "[4] Device Status",
+             self.test_device_status),
+        ]
+        
+        if not self.supports_batch:
+            steps += device_steps
+            outcomes = self._run_in_parallel([test_fn for _, _, test_fn in steps])
+        else:
+            # One /batch round trip (ops in device_steps order) replaces the
+            # separate /files and /status requests of tests 3 and 4
+            outcomes = self._run_in_parallel([test_fn for _, _, test_fn in steps] +
+                                             [lambda: self.batch_request(DEVICE_PROBES_BODY)])
+            (batch_results, batch_duration), batch_records = outcomes.pop()
+            for i, (_, _, test_fn) in enumerate(device_steps):
+                if batch_results and i < len(batch_results):
+                    entry = batch_results[i]
+                    batched = (entry.get('status'), entry.get('body'), batch_duration)
+                else:
+                    batched = ("Batch failed", None, batch_duration)
+                # Untimed as well: the batch ran alongside the other steps
+                result, records = self._run_buffered(lambda: test_fn(batched), timed=False)
+                outcomes.append((result, batch_records + records if i == 0 else records))
+            steps += device_steps
+        
+        for (name, title, _), (result, records) in zip(steps, outcomes):
+            self.log(f"\n{title}")
+            self.log("-" * 70)
+            for record in records:
+                logger.handle(record)
+            pipeline_results[name] = result
         
         # Test 5: Command test (list_files)
         self.log("\n[5] Device Command Test (list_files)")
@@ -657,12 +993,12 @@ class EdgeMonitorAPITester:
         try:
             response, duration = self.make_timed_request(
                 'POST', 
-                f"{self.base_url}/command",
-                json={"command": "list_files"},
-                headers={'Content-Type': 'application/json'}
+                self.command_url,
+                read_only=True,  # list_files only prints to the device's serial log
+                data=LIST_FILES_BODY
             )
             if response and response.status_code == 200:
-                result = response.json()
+                result = self._json(response)
                 self.log_with_timing(f"✅ Command executed: {result.get('message', 'OK')}", duration)
                 self.log(f"   ℹ️  Check device Serial Monitor for file listing")
                 pipeline_results["list_command"] = True
@@ -697,13 +1033,13 @@ class EdgeMonitorAPITester:
         self.log("   1. Flash the updated edge_monitor.ino to ESP32")
         self.log("   2. Record some videos to test file listing")
         self.log("   3. Test clear operations (destructive!)")
-        self.log("   4. Use Web UI at http://localhost:8000/system-status")
+        self.log(f"   4. Use Web UI at {self.server_url}/system-status")
         
         return pipeline_results
 
     def run_all_tests(self) -> Dict[str, Any]:
         """Run all API tests and return results with timing data"""
-        start_time = time.time()
+        start_ns = self._now()
         self.log("=" * 80)
         self.log("ESP32 Edge Monitor API Test Suite with Timing Analysis")
         self.log("=" * 80)
@@ -714,24 +1050,32 @@ class EdgeMonitorAPITester:
         connectivity_success, connectivity_time = self.test_connectivity()
         if not connectivity_success:
             self.log("❌ Cannot connect to device. Aborting tests.", "ERROR")
-            return {"connectivity": False, "total_time": time.time() - start_time}
+            flush_log()
+            return {"connectivity": False, "total_time": (self._now() - start_ns) / 1e9}
         
         results["connectivity"] = True
-        self.timing_results['connectivity'] = {'duration': connectivity_time}
-        
-        # Run all tests
-        status_data, status_times = self.test_status_endpoint()
-        results["status"] = status_data is not None
-        
-        # Test files endpoint
-        files_data, files_time = self.test_files_endpoint()
-        results["files"] = files_data is not None
+        self.record_timing('connectivity', {'duration': connectivity_time})
+        self.warm_up()
+        flush_log()
+        
+        # These tests report timings, so they run one after another: the
+        # device serves one request at a time, and running them together
+        # would time each one waiting behind the others
+        results["status"] = self.test_status_endpoint(self.iterations)[0] is not None
+        flush_log()
+        results["files"] = self.test_files_endpoint()[0] is not None
+        flush_log()
+        results["capture"] = self.test_capture_endpoint(self.iterations)[0]
+        flush_log()
         
-        results["capture"], capture_times = self.test_capture_endpoint()
         results["control"], control_times = self.test_control_endpoint()
+        flush_log()
         results["command"], command_times = self.test_command_endpoint()
+        flush_log()
         results["recording_config"], recording_times = self.test_recording_config_endpoint()
+        flush_log()
         results["apply_settings"], apply_time = self.test_apply_settings_endpoint()
+        flush_log()
         
         # Optionally test clear_sd (destructive)
         results["clear_sd"], clear_time = self.test_clear_sd_command()
@@ -742,9 +1086,10 @@ class EdgeMonitorAPITester:
         self.log("=" * 80)
         pipeline_results = self.test_complete_file_pipeline()
         results.update(pipeline_results)
+        flush_log()
         
         # Summary
-        total_time = time.time() - start_time
+        total_time = (self._now() - start_ns) / 1e9
         self.log("\n" + "=" * 80)
         self.log("FINAL TEST SUMMARY")
         self.log("=" * 80)
@@ -775,16 +1120,27 @@ class EdgeMonitorAPITester:
 def main():
     """Main function"""
     # Parse command line arguments
-    device_ip = sys.argv[1] if len(sys.argv) > 1 else "192.168.1.52"
-    port = int(sys.argv[2]) if len(sys.argv) > 2 else 80
+    parser = argparse.ArgumentParser(description="Test the ESP32 edge monitor API and time its endpoints")
+    parser.add_argument("device_ip", nargs="?", default="192.168.1.52", help="Device IP address (default: 192.168.1.52)")
+    parser.add_argument("port", nargs="?", type=int, default=80, help="Device HTTP port (default: 80)")
+    parser.add_argument("--server-url", default=SERVER_URL, help=f"Web server URL (default: {SERVER_URL})")
+    parser.add_argument("--yes-clear-sd", action="store_true",
+                        help="Run the destructive clear_sd test without asking for confirmation")
+    parser.add_argument("--iterations", type=int, default=3,
+                        help="Samples to take of /status and /capture (default: 3)")
+    args = parser.parse_args()
+    device_ip = args.device_ip
+    port = args.port
     
     print(f"Testing ESP32 Edge Monitor at {device_ip}:{port}")
     print(f"Started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
     # Create tester and run tests
-    tester = EdgeMonitorAPITester(device_ip, port)
-    results = tester.run_all_tests()
+    with EdgeMonitorAPITester(device_ip, port, server_url=args.server_url,
+                              allow_clear_sd=args.yes_clear_sd, iterations=args.iterations) as tester:
+        results = tester.run_all_tests()
+    flush_log()
     
     # Exit with appropriate code
     if all(results.get(k, False) for k in results.keys() if k not in ['total_time', 'timing_data']):
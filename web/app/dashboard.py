@@ -1,23 +1,52 @@
-import os, json
+import os, asyncio
+import aiofiles
+import orjson
 from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
-router = APIRouter()
+router = APIRouter(tags=["dashboard"])
 templates = Jinja2Templates(directory="templates")
 RESULT_FOLDER = "shared/results"
 
-@router.get("/dashboard", response_class=HTMLResponse)
-async def dashboard(request: Request):
+# Load and compile the template once; looking it up per request would
+# stat the file every time to check whether it needs reloading
+_TEMPLATE = templates.get_template("dashboard.html")
+
+# Parsed results, reused until the result folder changes
+_cache = {"key": None, "results": []}
+_cache_lock = asyncio.Lock()
+
+@router.on_event("startup")
+async def create_result_folder():
     os.makedirs(RESULT_FOLDER, exist_ok=True)
-    files = [f for f in os.listdir(RESULT_FOLDER) if f.endswith(".json")]
 
-    results = []
-    for f in files:
-        with open(os.path.join(RESULT_FOLDER, f)) as j:
-            results.append((f, json.load(j)))
+def scan_result_folder():
+    # One scandir pass gives both the result files and a cache key. Adding,
+    # removing or renaming a file bumps the folder's mtime; rewriting one
+    # in place only bumps that file's
+    with os.scandir(RESULT_FOLDER) as it:
+        entries = [e for e in it if e.name.endswith(".json") and e.is_file()]
+    newest = max((e.stat().st_mtime_ns for e in entries), default=0)
+    return (os.stat(RESULT_FOLDER).st_mtime_ns, newest), entries
+
+async def load_result(entry):
+    async with aiofiles.open(entry.path, "rb") as j:
+        return entry.name, orjson.loads(await j.read())
+
+@router.get("/dashboard", response_class=HTMLResponse)
+async def dashboard(request: Request):
+    # The lock stops concurrent requests from all re-reading a changed folder
+    async with _cache_lock:
+        key, entries = await asyncio.to_thread(scan_result_folder)
+        if key != _cache["key"]:
+            # Keep disk I/O off the event loop and read the result files concurrently
+            _cache["results"] = await asyncio.gather(*(load_result(e) for e in entries))
+            _cache["key"] = key
+        results = _cache["results"]
 
-    return templates.TemplateResponse("dashboard.html", {
-        "request": request,
-        "results": results
-    })
+    # Send the page as it renders instead of building the whole HTML string;
+    # buffering groups Jinja's many small chunks into fewer writes
+    stream = _TEMPLATE.stream(request=request, results=results)
+    stream.enable_buffering(64)
+    return StreamingResponse(stream, media_type="text/html")
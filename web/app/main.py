@@ -1,36 +1,75 @@
 from fastapi import FastAPI, File, UploadFile, HTTPException, Request
-from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 import uvicorn
 import os
-import json
-import requests
+import aiofiles
+import orjson
+import httpx
 import time
-import io
+import asyncio
+import errno
+import random
+import re
+import ipaddress
+import socket
+import traceback
 from datetime import datetime
+from operator import itemgetter
+from pathlib import Path
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
+from zeroconf import IPVersion, ServiceStateChange
+from zeroconf.asyncio import AsyncServiceBrowser, AsyncServiceInfo, AsyncZeroconf
 import logging
-import io
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+
+# ID of the HTTP request being handled, attached to every log line it causes
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+class JsonLogFormatter(logging.Formatter):
+    """Format records as one JSON object per line
+    
+    Fields passed through `extra=` are included as-is, as is the current
+    request ID.
+    """
+    _RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+    
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = request_id_var.get()
+        if request_id:
+            entry["request_id"] = request_id
+        entry.update((k, v) for k, v in vars(record).items() if k not in self._RESERVED)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
 
 # Set up logging
-logging.basicConfig(level=logging.INFO)
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(JsonLogFormatter())
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
 logger = logging.getLogger(__name__)
 
 
 
 # Background device discovery
-import asyncio
-import threading
-from concurrent.futures import ThreadPoolExecutor
 
-executor = ThreadPoolExecutor(max_workers=1)
+# Strong reference to the running discovery task; the event loop only keeps a weak one
+_discovery_task = None
 
-def discover_devices_background():
-    """Run device discovery in background thread"""
+async def discover_devices_background(force=False):
+    """Run device discovery in the background"""
     try:
-        devices = discover_edge_devices(force=True)
+        devices = await discover_edge_devices(force=force)
         if devices:
             print(f"Background discovery found {len(devices)} devices")
         else:
@@ -38,39 +77,99 @@ def discover_devices_background():
     except Exception as e:
         print(f"Background discovery error: {e}")
 
-def start_background_discovery():
-    """Start device discovery in background"""
-    executor.submit(discover_devices_background)
+def start_background_discovery(force=False):
+    """Start device discovery in background
+    
+    Only one scan runs at a time: returns False without starting another if
+    one is still in progress. Unless forced, a scan within DISCOVERY_INTERVAL
+    of the last one just keeps the devices already found.
+    """
+    global _discovery_task
+    if _discovery_task is not None and not _discovery_task.done():
+        return False
+    _discovery_task = asyncio.create_task(discover_devices_background(force))
+    return True
 
-app = FastAPI(title="Edge Monitor Web Server")
+app = FastAPI(title="Edge Monitor Web Server", default_response_class=ORJSONResponse)
 
 # Mount static files and templates
-import os
-from pathlib import Path
-
 # Get the directory where this script is located
-BASE_DIR = Path(__file__).parent
+BASE_DIR = Path(__file__).resolve().parent
 
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
 templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
 # Add this after: app = FastAPI(title="Edge Monitor Web Server")
 
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all incoming HTTP requests"""
-    start_time = time.time()
-    
-    # Log incoming request
-    logger.info(f"�� {request.method} {request.url.path} from {request.client.host if request.client else 'unknown'}")
-    
-    # Process request
-    response = await call_next(request)
-    
-    # Log response
-    process_time = time.time() - start_time
-    logger.info(f"📤 {request.method} {request.url.path} -> {response.status_code} ({process_time:.3f}s)")
-    
-    return response
+# Paths the UI polls; their access lines go to DEBUG so they don't drown out the rest
+QUIET_PATH_PREFIXES = ("/static",)
+QUIET_PATHS = ("/api/camera/discovery-status", "/api/camera/stream")
+# Those two are polled several times a second; only this fraction of their requests is logged
+LOG_SAMPLE_RATE = float(os.environ.get("LOG_SAMPLE_RATE", "0.1"))
+
+class RequestLogMiddleware:
+    """Log all incoming HTTP requests
+
+    Plain ASGI middleware: unlike @app.middleware("http") it does not wrap
+    every request in a task group or build Request/Response objects. Each
+    request gets an ID, returned as X-Request-ID and logged with every line
+    written while handling it.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        path = scope["path"]
+        quiet = path in QUIET_PATHS or path.startswith(QUIET_PATH_PREFIXES)
+        log = logger.debug if quiet else logger.info
+        if path in QUIET_PATHS and random.random() >= LOG_SAMPLE_RATE:
+            log = None
+        request_id = uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), (b"x-request-id", request_id.encode())]
+                if log:
+                    # One line per request, formatted only if the level is enabled
+                    client = scope.get("client")
+                    log("request", extra={
+                        "method": scope["method"],
+                        "path": path,
+                        "client": client[0] if client else "unknown",
+                        "status": message["status"],
+                        "duration_ms": round((time.perf_counter() - start_time) * 1000, 1),
+                    })
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
+
+app.add_middleware(RequestLogMiddleware)
+
+# ESP32 devices can be slow to respond, especially when busy with recording/uploading
+DEVICE_TIMEOUT = httpx.Timeout(20.0, connect=3.0)
+# Configuring checks a freshly typed address, so an unreachable one should fail fast
+CONFIGURE_TIMEOUT = httpx.Timeout(15.0, connect=1.5)
+
+@app.on_event("startup")
+async def open_device_client():
+    """Create the shared client used for all device requests"""
+    app.state.http = httpx.AsyncClient(
+        timeout=DEVICE_TIMEOUT,
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+    )
+
+@app.on_event("shutdown")
+async def close_device_client():
+    await app.state.http.aclose()
 
 
 
@@ -82,14 +181,22 @@ DISCOVERY_INTERVAL = 30  # seconds
 # Device configuration storage
 DEVICE_CONFIG_FILE = BASE_DIR / "device_config.json"
 configured_device = None  # Will store {"ip": "x.x.x.x", "port": 80}
+# URL of configured_device, rebuilt only when the configuration is loaded or saved
+_primary_device_url: Optional[str] = None
+
+def _device_url(device):
+    if device and device.get('ip'):
+        return f"http://{device['ip']}:{device.get('port', 80)}"
+    return None
 
 def load_device_config():
     """Load saved device configuration from file"""
-    global configured_device
+    global configured_device, _primary_device_url
     if DEVICE_CONFIG_FILE.exists():
         try:
-            with open(DEVICE_CONFIG_FILE, 'r') as f:
-                configured_device = json.load(f)
+            with open(DEVICE_CONFIG_FILE, 'rb') as f:
+                configured_device = orjson.loads(f.read())
+                _primary_device_url = _device_url(configured_device)
                 logger.info(f"Loaded device config: {configured_device}")
                 return configured_device
         except Exception as e:
@@ -98,28 +205,32 @@ def load_device_config():
 
 def save_device_config(ip: str, port: int):
     """Save device configuration to file"""
-    global configured_device
+    global configured_device, _primary_device_url
     configured_device = {"ip": ip, "port": port}
+    _primary_device_url = _device_url(configured_device)
     try:
-        with open(DEVICE_CONFIG_FILE, 'w') as f:
-            json.dump(configured_device, f)
+        with open(DEVICE_CONFIG_FILE, 'wb') as f:
+            f.write(orjson.dumps(configured_device))
         logger.info(f"Saved device config: {configured_device}")
         return True
     except Exception as e:
         logger.error(f"Error saving device config: {e}")
         return False
 
+@app.on_event("startup")
+async def load_saved_device():
+    """Load the saved device configuration once, before serving requests"""
+    load_device_config()
+    if configured_device:
+        logger.info(f"Using configured device: {configured_device['ip']}:{configured_device.get('port', 80)}")
+    else:
+        logger.info("No device configured. Please configure a device through the web interface.")
+
 def get_primary_device():
     """Get the primary edge device IP from saved configuration"""
-    global configured_device
-    
-    # Load device config if not already loaded
-    if configured_device is None:
-        load_device_config()
-    
     # Use the configured device if available
-    if configured_device and configured_device.get('ip'):
-        return f"http://{configured_device['ip']}:{configured_device.get('port', 80)}"
+    if _primary_device_url:
+        return _primary_device_url
     
     # Fallback to discovered devices if any exist
     if connected_devices:
@@ -154,8 +265,43 @@ class CameraSettings(BaseModel):
     fps: Optional[int] = None
     frame_delay: Optional[int] = None
 
+class UploadInit(BaseModel):
+    filename: Optional[str] = None
+    size: int
+
+class UploadComplete(BaseModel):
+    upload_id: str
+
+# Discovery probes give up quickly; an edge monitor on the LAN answers well within this
+PROBE_TIMEOUT = httpx.Timeout(2.0, connect=0.5)
+# The configured device is checked first and must answer within this to skip the scan
+CONFIGURED_PROBE_TIMEOUT = 0.5
+# Cap on probes in flight at once during a scan
+MAX_CONCURRENT_PROBES = 32
+# Scanned addresses that weren't an edge monitor are skipped for this long,
+# except by a forced discovery
+DEAD_HOST_TTL = 300  # seconds
+_dead_hosts: Dict[tuple, float] = {}  # (ip, port) -> time to probe again
+
+def get_local_ip():
+    """IP address of the interface used for outbound traffic
+    
+    Connecting a UDP socket only picks a route, nothing is sent. Unlike
+    gethostbyname(gethostname()) this doesn't return 127.0.1.1 on Debian
+    style hosts; that lookup is kept as fallback for networks without a
+    default route (e.g. a laptop joined to the device's own access point).
+    """
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        s.connect(("8.8.8.8", 80))
+        return s.getsockname()[0]
+    except OSError:
+        return socket.gethostbyname(socket.gethostname())
+    finally:
+        s.close()
+
 # Device discovery and management
-def discover_edge_devices(force=False):
+async def discover_edge_devices(force=False):
     """Discover edge monitoring devices on the network using multiple methods"""
     global last_device_discovery, connected_devices
     
@@ -164,64 +310,80 @@ def discover_edge_devices(force=False):
         return list(connected_devices.keys())
     
     logger.info("Discovering edge devices...")
-    discovered = []
     
-    # Method 1: Try mDNS discovery first (most reliable)
-    try:
-        import subprocess
-        result = subprocess.run(['avahi-browse', '-rt', '_http._tcp'], 
-                              capture_output=True, text=True, timeout=5)
-        if result.returncode == 0:
-            for line in result.stdout.split('\n'):
-                if 'edge-monitor' in line and 'IPv4' in line:
-                    parts = line.split()
-                    if len(parts) >= 7:
-                        ip = parts[7]
-                        if try_connect_device(ip, 80, discovered, current_time):
-                            logger.info(f"Found device via mDNS: {ip}")
-    except:
-        pass  # mDNS not available, continue with other methods
+    # Method 1: mDNS (most reliable); announced devices are tracked as they
+    # appear, see on_mdns_service_change
+    discovered = list(dict.fromkeys(mdns_devices.values()))
+    
+    # The configured device answering quickly is the normal case; only scan
+    # the network when it doesn't
+    if configured_device:
+        found = []
+        if await try_connect_device(configured_device['ip'], configured_device.get('port', 80),
+                                    found, current_time, timeout=CONFIGURED_PROBE_TIMEOUT):
+            last_device_discovery = current_time
+            return list(dict.fromkeys(found + discovered))
+    
+    # Devices that announced themselves over mDNS make the scan unnecessary too
+    if discovered:
+        last_device_discovery = current_time
+        return discovered
+    
+    # Each candidate host is probed on its ports in order, stopping at the
+    # first hit; all hosts are probed concurrently
+    probe_slots = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+    
+    async def probe_host(ip_str, ports):
+        for port in ports:
+            if not force and _dead_hosts.get((ip_str, port), 0) > current_time:
+                continue
+            async with probe_slots:
+                if await try_connect_device(ip_str, port, discovered, current_time):
+                    _dead_hosts.pop((ip_str, port), None)
+                    return True
+            _dead_hosts[(ip_str, port)] = current_time + DEAD_HOST_TTL
+        return False
     
     # Method 2: Try known common ESP32 IPs (faster than scanning)
     common_ips = ["192.168.1.52", "192.168.1.100", "192.168.1.101", "192.168.1.102"]
-    for ip in common_ips:
-        if try_connect_device(ip, 80, discovered, current_time):
-            continue
+    candidates = [(ip, [80]) for ip in common_ips]
     
     # Method 3: Network scanning (slowest, last resort)
-    import ipaddress
-    import socket
-    
     try:
         # Get local IP to determine subnet
-        hostname = socket.gethostname()
-        local_ip = socket.gethostbyname(hostname)
+        local_ip = get_local_ip()
         network = ipaddress.IPv4Network(f"{local_ip}/24", strict=False)
         
         # Common ports for ESP32 devices
         test_ports = [80, 8080, 81]
         
         # Scan network (limit to 30 IPs for speed)
-        for ip in list(network.hosts())[:30]:
-            ip_str = str(ip)
-            if ip_str in [d.split(':')[0] for d in discovered]:
-                continue  # Skip already discovered
-                
-            for port in test_ports:
-                if try_connect_device(ip_str, port, discovered, current_time):
-                    break
+        candidates += [(str(ip), test_ports) for ip in list(network.hosts())[:30]]
                     
     except Exception as e:
         logger.error(f"Network discovery error: {e}")
     
+    # Skip hosts already found via mDNS or listed twice
+    found_ips = {d.split(':')[0] for d in discovered}
+    hosts = {}
+    for ip_str, ports in candidates:
+        if ip_str not in found_ips:
+            hosts.setdefault(ip_str, ports)
+    
+    results = await asyncio.gather(*(probe_host(ip_str, ports) for ip_str, ports in hosts.items()),
+                                   return_exceptions=True)
+    for error in results:
+        if isinstance(error, Exception):
+            logger.error(f"Network discovery error: {error}")
+    
     last_device_discovery = current_time
     return discovered
 
-def try_connect_device(ip_str, port, discovered, current_time):
+async def try_connect_device(ip_str, port, discovered, current_time, timeout=PROBE_TIMEOUT):
     """Try to connect to a device and add it if it's an edge monitor"""
     try:
         # Try status endpoint first (most reliable)
-        response = requests.get(f"http://{ip_str}:{port}/status", timeout=3)
+        response = await app.state.http.get(f"http://{ip_str}:{port}/status", timeout=timeout)
         if response.status_code == 200:
             try:
                 data = response.json()
@@ -243,10 +405,10 @@ def try_connect_device(ip_str, port, discovered, current_time):
             except:
                 pass
                 
-    except requests.exceptions.RequestException:
+    except httpx.HTTPError:
         # Try root endpoint as fallback
         try:
-            response = requests.get(f"http://{ip_str}:{port}/", timeout=2)
+            response = await app.state.http.get(f"http://{ip_str}:{port}/", timeout=timeout)
             if response.status_code == 200:
                 text = response.text.lower()
                 if ("esp32" in text and "edge monitor" in text) or "edge_monitor" in text:
@@ -274,7 +436,60 @@ def try_connect_device(ip_str, port, discovered, current_time):
     
     return False
 
-def make_device_request(endpoint: str, method: str = "GET", data: dict = None):
+# The firmware announces a dedicated _edge-monitor._tcp service; older firmware
+# only announces _http._tcp as "edge-monitor" with a device_type TXT record
+EDGE_MONITOR_SERVICE_TYPE = "_edge-monitor._tcp.local."
+MDNS_SERVICE_TYPES = [EDGE_MONITOR_SERVICE_TYPE, "_http._tcp.local."]
+mdns_devices: Dict[str, str] = {}  # mDNS service name -> "ip:port"
+_mdns_probes = set()  # Strong references to running probe tasks
+
+async def probe_mdns_service(zeroconf, service_type, name):
+    """Resolve an announced service and add it if it's an edge monitor"""
+    info = AsyncServiceInfo(service_type, name)
+    if not await info.async_request(zeroconf, 3000):
+        return
+    if (service_type != EDGE_MONITOR_SERVICE_TYPE and "edge-monitor" not in name.lower()
+            and info.properties.get(b"device_type") != b"edge_monitor"):
+        return
+    
+    found = []
+    for ip in info.parsed_addresses(IPVersion.V4Only):
+        if await try_connect_device(ip, info.port, found, time.time()):
+            mdns_devices[name] = found[0]
+            logger.info(f"Found device via mDNS: {found[0]}")
+            return
+
+def on_mdns_service_change(zeroconf, service_type, name, state_change):
+    """ServiceBrowser callback, run on the event loop"""
+    if state_change is ServiceStateChange.Added:
+        task = asyncio.create_task(probe_mdns_service(zeroconf, service_type, name))
+        _mdns_probes.add(task)
+        task.add_done_callback(_mdns_probes.discard)
+    elif state_change is ServiceStateChange.Removed:
+        # Forget the device unless it is still announced under the other service type
+        key = mdns_devices.pop(name, None)
+        if key and key not in mdns_devices.values():
+            connected_devices.pop(key, None)
+
+@app.on_event("startup")
+async def start_mdns_browser():
+    """Listen for edge monitors announcing themselves over mDNS"""
+    app.state.zeroconf = None
+    try:
+        zc = AsyncZeroconf()
+        app.state.mdns_browser = AsyncServiceBrowser(zc.zeroconf, MDNS_SERVICE_TYPES,
+                                                     handlers=[on_mdns_service_change])
+        app.state.zeroconf = zc
+    except Exception as e:
+        logger.warning(f"mDNS not available, discovery will rely on scanning: {e}")
+
+@app.on_event("shutdown")
+async def stop_mdns_browser():
+    if app.state.zeroconf:
+        await app.state.mdns_browser.async_cancel()
+        await app.state.zeroconf.async_close()
+
+async def make_device_request(endpoint: str, method: str = "GET", data: dict = None):
     """Make a request to the edge device"""
     device_url = get_primary_device()
     if not device_url:
@@ -282,145 +497,170 @@ def make_device_request(endpoint: str, method: str = "GET", data: dict = None):
     
     try:
         url = f"{device_url}{endpoint}"
-        # ESP32 devices can be slow to respond, especially when busy with recording/uploading
-        timeout = 20
         if method == "GET":
-            response = requests.get(url, timeout=timeout)
+            response = await app.state.http.get(url)
         elif method == "POST":
-            response = requests.post(url, json=data, timeout=timeout)
+            response = await app.state.http.post(url, json=data)
         else:
             raise ValueError(f"Unsupported method: {method}")
         
         response.raise_for_status()
         return response.json()
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Device request failed: {e}")
         raise HTTPException(status_code=503, detail=f"Device communication error: {str(e)}")
 
 # Web interface routes
+# None of these pages has per-request content, so each is rendered once
+_PAGES = {
+    name: templates.get_template(name).render(request=None)
+    for name in ("index.html", "camera_control.html", "api_docs.html",
+                 "system_status.html", "test_compatibility.html")
+}
+
 @app.get("/", response_class=HTMLResponse)
-async def read_root(request: Request):
+async def read_root():
     """Main landing page with navigation and API documentation"""
-    return templates.TemplateResponse("index.html", {"request": request})
+    return HTMLResponse(_PAGES["index.html"])
 
 @app.get("/camera-control", response_class=HTMLResponse)
-async def camera_control(request: Request):
+async def camera_control():
     """Camera control interface"""
-    return templates.TemplateResponse("camera_control.html", {"request": request})
+    return HTMLResponse(_PAGES["camera_control.html"])
 
 @app.get("/api-docs", response_class=HTMLResponse)
-async def api_documentation(request: Request):
+async def api_documentation():
     """API documentation page"""
-    return templates.TemplateResponse("api_docs.html", {"request": request})
+    return HTMLResponse(_PAGES["api_docs.html"])
 
 @app.get("/system-status", response_class=HTMLResponse)
-async def system_status_page(request: Request):
+async def system_status_page():
     """System status and monitoring page"""
-    return templates.TemplateResponse("system_status.html", {"request": request})
+    return HTMLResponse(_PAGES["system_status.html"])
 
 @app.get("/test", response_class=HTMLResponse)
-async def compatibility_test(request: Request):
+async def compatibility_test():
     """ESP32 compatibility test page"""
-    return templates.TemplateResponse("test_compatibility.html", {"request": request})
+    return HTMLResponse(_PAGES["test_compatibility.html"])
 
-@app.get("/api/info")
-async def api_info():
-    """Get API information and available endpoints"""
-    return {
-        "title": "Edge Monitor Web Server API",
-        "version": "1.0.0",
-        "description": "API for controlling and monitoring ESP32-based edge camera devices",
-        "endpoints": {
-            "device_discovery": {
-                "url": "/api/camera/discover",
-                "method": "POST",
-                "description": "Discover edge monitoring devices on the network",
-                "response": "List of discovered devices with IP addresses"
-            },
-            "add_device": {
-                "url": "/api/camera/add-device",
-                "method": "POST",
-                "description": "Manually add a device by IP address",
-                "parameters": {"ip": "string", "port": "integer (optional, default 80)"},
-                "response": "Success confirmation with device info"
-            },
-            "device_status": {
-                "url": "/api/camera/status",
-                "method": "GET", 
-                "description": "Get current camera and system status",
-                "response": "Device status including camera, WiFi, SD card, memory info"
-            },
-            "camera_settings": {
-                "url": "/api/camera/setting",
-                "method": "POST",
-                "description": "Update individual camera settings",
-                "parameters": {"setting": "string", "value": "integer"},
-                "examples": ["framesize", "quality", "brightness", "contrast", "saturation"]
-            },
-            "recording_settings": {
-                "url": "/api/camera/recording-setting", 
-                "method": "POST",
-                "description": "Update recording configuration",
-                "parameters": {"setting": "string", "value": "integer"},
-                "examples": ["interval", "duration", "stream_interval"]
-            },
-            "device_commands": {
-                "url": "/api/camera/command",
-                "method": "POST", 
-                "description": "Send commands to the device",
-                "parameters": {"command": "string"},
-                "examples": ["start", "stop", "pause", "restart", "photo"]
-            },
-            "bulk_settings": {
-                "url": "/api/camera/apply-settings",
-                "method": "POST",
-                "description": "Apply multiple settings at once",
-                "parameters": "JSON object with multiple setting key-value pairs"
-            },
-            "camera_stream": {
-                "url": "/api/camera/stream",
-                "method": "GET",
-                "description": "Get current camera image",
-                "response": "JPEG image stream"
-            },
-            "image_upload": {
-                "url": "/api/upload-image", 
-                "method": "POST",
-                "description": "Receive images from edge devices",
-                "parameters": "Multipart file upload"
-            },
-            "video_upload": {
-                "url": "/upload",
-                "method": "POST", 
-                "description": "Upload video files from edge devices",
-                "parameters": "Multipart file upload"
-            }
+# /api/info never changes, so it is encoded once at import
+_API_INFO_BYTES = orjson.dumps({
+    "title": "Edge Monitor Web Server API",
+    "version": "1.0.0",
+    "description": "API for controlling and monitoring ESP32-based edge camera devices",
+    "endpoints": {
+        "device_discovery": {
+            "url": "/api/camera/discover",
+            "method": "POST",
+            "description": "Discover edge monitoring devices on the network",
+            "response": "List of discovered devices with IP addresses"
         },
-        "web_pages": {
-            "home": {
-                "url": "/",
-                "description": "Main landing page with navigation and overview"
-            },
-            "camera_control": {
-                "url": "/camera-control",
-                "description": "Interactive camera control interface"
-            },
-            "api_documentation": {
-                "url": "/api-docs", 
-                "description": "Detailed API documentation and examples"
+        "add_device": {
+            "url": "/api/camera/add-device",
+            "method": "POST",
+            "description": "Manually add a device by IP address",
+            "parameters": {"ip": "string", "port": "integer (optional, default 80)"},
+            "response": "Success confirmation with device info"
+        },
+        "device_status": {
+            "url": "/api/camera/status",
+            "method": "GET", 
+            "description": "Get current camera and system status",
+            "response": "Device status including camera, WiFi, SD card, memory info"
+        },
+        "camera_settings": {
+            "url": "/api/camera/setting",
+            "method": "POST",
+            "description": "Update individual camera settings",
+            "parameters": {"setting": "string", "value": "integer"},
+            "examples": ["framesize", "quality", "brightness", "contrast", "saturation"]
+        },
+        "recording_settings": {
+            "url": "/api/camera/recording-setting", 
+            "method": "POST",
+            "description": "Update recording configuration",
+            "parameters": {"setting": "string", "value": "integer"},
+            "examples": ["interval", "duration", "stream_interval"]
+        },
+        "device_commands": {
+            "url": "/api/camera/command",
+            "method": "POST", 
+            "description": "Send commands to the device",
+            "parameters": {"command": "string"},
+            "examples": ["start", "stop", "pause", "restart", "photo"]
+        },
+        "bulk_settings": {
+            "url": "/api/camera/apply-settings",
+            "method": "POST",
+            "description": "Apply multiple settings at once",
+            "parameters": "JSON object with multiple setting key-value pairs"
+        },
+        "camera_stream": {
+            "url": "/api/camera/stream",
+            "method": "GET",
+            "description": "Get current camera image",
+            "response": "JPEG image stream"
+        },
+        "camera_mjpeg": {
+            "url": "/api/camera/mjpeg",
+            "method": "GET",
+            "description": "Live camera view; all viewers share the same device captures",
+            "response": "multipart/x-mixed-replace MJPEG stream"
+        },
+        "image_upload": {
+            "url": "/api/upload-image", 
+            "method": "POST",
+            "description": "Receive images from edge devices",
+            "parameters": "Multipart file upload"
+        },
+        "video_upload": {
+            "url": "/upload",
+            "method": "POST", 
+            "description": "Upload video files from edge devices",
+            "parameters": "Multipart file upload"
+        },
+        "chunked_upload": {
+            "url": "/upload/init, /upload/chunk/{upload_id}/{seq}, /upload/complete",
+            "method": "POST",
+            "description": "Upload a video in pieces that can be sent in any order and retried individually",
+            "parameters": {
+                "init": {"filename": "string (optional)", "size": "integer"},
+                "chunk": "Raw bytes with a Content-Range: bytes start-end/size header",
+                "complete": {"upload_id": "string"}
             },
-            "system_status": {
-                "url": "/system-status",
-                "description": "System monitoring and device status dashboard"
-            }
+            "response": "init returns upload_id; each chunk returns the byte ranges still missing"
+        }
+    },
+    "web_pages": {
+        "home": {
+            "url": "/",
+            "description": "Main landing page with navigation and overview"
         },
-        "device_requirements": {
-            "device_type": "edge_monitor",
-            "required_endpoints": ["/status", "/control", "/command", "/capture"],
-            "optional_endpoints": ["/recording-config", "/apply-settings"],
-            "communication": "HTTP REST API over WiFi"
+        "camera_control": {
+            "url": "/camera-control",
+            "description": "Interactive camera control interface"
+        },
+        "api_documentation": {
+            "url": "/api-docs", 
+            "description": "Detailed API documentation and examples"
+        },
+        "system_status": {
+            "url": "/system-status",
+            "description": "System monitoring and device status dashboard"
         }
+    },
+    "device_requirements": {
+        "device_type": "edge_monitor",
+        "required_endpoints": ["/status", "/control", "/command", "/capture"],
+        "optional_endpoints": ["/recording-config", "/apply-settings"],
+        "communication": "HTTP REST API over WiFi"
     }
+})
+
+@app.get("/api/info")
+async def api_info():
+    """Get API information and available endpoints"""
+    return Response(content=_API_INFO_BYTES, media_type="application/json")
 
 # API endpoints for camera control
 
@@ -429,11 +669,14 @@ async def api_info():
 async def discover_camera_manual():
     """Manually discover edge monitoring devices with UI feedback"""
     try:
-        # Start background discovery
-        start_background_discovery()
+        # Start background discovery, or join the scan already running
+        if start_background_discovery():
+            message = "Device discovery started in background"
+        else:
+            message = "Device discovery already in progress"
         return {
             "success": True,
-            "message": "Device discovery started in background",
+            "message": message,
             "status": "discovering"
         }
     except Exception as e:
@@ -456,7 +699,7 @@ async def get_discovery_status():
 async def discover_camera():
     """Discover edge monitoring devices"""
     try:
-        devices = discover_edge_devices(force=True)
+        devices = await discover_edge_devices(force=True)
         if devices:
             device_key = devices[0]
             device_info = connected_devices[device_key]
@@ -491,7 +734,7 @@ async def add_device(request: Request):
         # Test connection to the device
         device_url = f"http://{ip}:{port}"
         try:
-            response = requests.get(f"{device_url}/status", timeout=5)
+            response = await app.state.http.get(f"{device_url}/status", timeout=5)
             if response.status_code == 200:
                 device_info = {
                     "ip": ip,
@@ -534,35 +777,13 @@ async def configure_device(request: Request):
         if not ip:
             return {"success": False, "error": "IP address required"}
         
-        # First test basic connectivity with nc (much faster)
-        import subprocess
-        try:
-            logger.info(f"Testing basic connectivity to {ip}:{port} with nc")
-            result = subprocess.run(['nc', '-zv', ip, str(port)], 
-                                  capture_output=True, text=True, timeout=3)
-            if result.returncode != 0:
-                logger.error(f"nc connectivity test failed: {result.stderr}")
-                return {
-                    "success": False,
-                    "error": f"Cannot reach device at {ip}:{port}. Check IP address and network connection."
-                }
-            logger.info(f"nc connectivity test passed: {result.stdout}")
-        except subprocess.TimeoutExpired:
-            logger.error(f"nc connectivity test timed out")
-            return {
-                "success": False,
-                "error": f"Connection timeout to device at {ip}:{port}"
-            }
-        except FileNotFoundError:
-            logger.warning("nc command not found, skipping connectivity test")
-        except Exception as e:
-            logger.warning(f"nc test failed: {e}, continuing with HTTP test")
-        
-        # Now test HTTP endpoint (this can be slow)
+        # One HTTP request checks both reachability and the device itself: a
+        # short connect timeout catches a wrong address, the long read timeout
+        # allows for a busy device
         device_url = f"http://{ip}:{port}"
         try:
             logger.info(f"Testing HTTP endpoint {device_url}/status")
-            response = requests.get(f"{device_url}/status", timeout=15)
+            response = await app.state.http.get(f"{device_url}/status", timeout=CONFIGURE_TIMEOUT)
             logger.info(f"HTTP test response: {response.status_code}")
             
             if response.status_code == 200:
@@ -571,7 +792,7 @@ async def configure_device(request: Request):
                 
                 # Save configuration
                 logger.info(f"Saving device config to: {DEVICE_CONFIG_FILE}")
-                if save_device_config(ip, port):
+                if await asyncio.to_thread(save_device_config, ip, port):
                     logger.info(f"Device configured successfully: {ip}:{port}")
                     return {
                         "success": True,
@@ -593,13 +814,19 @@ async def configure_device(request: Request):
                     "success": False,
                     "error": f"Device returned status code {response.status_code}"
                 }
-        except requests.exceptions.Timeout:
+        except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+            logger.error(f"Cannot connect to {device_url}: {e}")
+            return {
+                "success": False,
+                "error": f"Cannot reach device at {ip}:{port}. Check IP address and network connection."
+            }
+        except httpx.TimeoutException:
             logger.error(f"HTTP request timeout to {device_url}")
             return {
                 "success": False,
                 "error": f"Device HTTP response timeout at {ip}:{port} (device may be busy)"
             }
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             logger.error(f"HTTP request error to {device_url}: {str(e)}")
             return {
                 "success": False,
@@ -608,7 +835,6 @@ async def configure_device(request: Request):
         
     except Exception as e:
         logger.error(f"Configure device error: {e}")
-        import traceback
         traceback.print_exc()
         return {
             "success": False,
@@ -622,8 +848,8 @@ async def get_device_config():
     if configured_device:
         # Try to get current status (with quick timeout for status check)
         try:
-            device_url = f"http://{configured_device['ip']}:{configured_device.get('port', 80)}"
-            response = requests.get(f"{device_url}/status", timeout=5)
+            device_url = _primary_device_url
+            response = await app.state.http.get(f"{device_url}/status", timeout=5)
             if response.status_code == 200:
                 return {
                     "success": True,
@@ -652,7 +878,7 @@ async def get_device_config():
 async def get_camera_status():
     """Get current camera and system status"""
     try:
-        status = make_device_request("/status")
+        status = await make_device_request("/status")
         return {
             "success": True,
             "status": status
@@ -668,7 +894,7 @@ async def get_camera_status():
 async def update_camera_setting(setting: CameraSetting):
     """Update a camera setting"""
     try:
-        result = make_device_request("/control", "POST", {
+        result = await make_device_request("/control", "POST", {
             "var": setting.setting,
             "val": setting.value
         })
@@ -687,7 +913,7 @@ async def update_camera_setting(setting: CameraSetting):
 async def update_recording_setting(setting: RecordingSetting):
     """Update a recording setting"""
     try:
-        result = make_device_request("/recording-config", "POST", {
+        result = await make_device_request("/recording-config", "POST", {
             "setting": setting.setting,
             "value": setting.value
         })
@@ -706,7 +932,7 @@ async def update_recording_setting(setting: RecordingSetting):
 async def send_camera_command(command: Command):
     """Send a command to the camera"""
     try:
-        result = make_device_request("/command", "POST", {
+        result = await make_device_request("/command", "POST", {
             "command": command.command
         })
         return {
@@ -730,7 +956,7 @@ async def control_motor(request: Request):
         # Clamp speed to -100 to 100 range
         speed = max(-100, min(100, int(speed)))
         
-        result = make_device_request("/motor", "POST", {
+        result = await make_device_request("/motor", "POST", {
             "speed": speed
         })
         
@@ -753,7 +979,7 @@ async def apply_all_settings(settings: CameraSettings):
         # Convert settings to dict and filter out None values
         settings_dict = {k: v for k, v in settings.dict().items() if v is not None}
         
-        result = make_device_request("/apply-settings", "POST", settings_dict)
+        result = await make_device_request("/apply-settings", "POST", settings_dict)
         return {
             "success": True,
             "result": result
@@ -765,69 +991,294 @@ async def apply_all_settings(settings: CameraSettings):
             "error": str(e)
         }
 
+PLACEHOLDER_PATH = BASE_DIR / "static" / "placeholder-camera.png"
+# Placeholder image bytes, loaded at startup; None if there is no placeholder
+_placeholder_image: Optional[bytes] = None
+
+@app.on_event("startup")
+async def load_placeholder_image():
+    global _placeholder_image
+    if PLACEHOLDER_PATH.exists():
+        _placeholder_image = PLACEHOLDER_PATH.read_bytes()
+
+# The device serves single frames from /capture and has no stream of its own.
+# When a frame is shared it is kept in one slot: every client asking within
+# FRAME_MAX_AGE of the last capture gets that frame (or that capture's error)
+# instead of another request to the device, and simultaneous askers all await
+# one capture task.
+FRAME_MAX_AGE = 0.2  # seconds
+CAPTURE_TIMEOUT = httpx.Timeout(10.0, connect=1.5)
+MJPEG_BOUNDARY = "frame"
+_latest_frame: Dict[str, Any] = {"jpeg": None, "error": None, "at": 0.0}
+_capture_task: Optional[asyncio.Task] = None
+# Open MJPEG streams, and /api/camera/stream relays still being sent
+_mjpeg_viewers = 0
+_relays = 0
+
+async def capture_frame():
+    """Fetch one frame from the device into the shared slot"""
+    try:
+        device_url = get_primary_device()
+        if not device_url:
+            raise HTTPException(status_code=503, detail="No edge device connected")
+        response = await app.state.http.get(f"{device_url}/capture", timeout=CAPTURE_TIMEOUT)
+        response.raise_for_status()
+        _latest_frame["jpeg"], _latest_frame["error"] = response.content, None
+    except Exception as e:
+        _latest_frame["jpeg"], _latest_frame["error"] = None, e
+    finally:
+        _latest_frame["at"] = time.monotonic()
+
+def frame_is_shared():
+    """Whether a frame request should go through the shared slot"""
+    return bool(
+        _mjpeg_viewers or _relays
+        or (_capture_task is not None and not _capture_task.done())
+        or time.monotonic() - _latest_frame["at"] < FRAME_MAX_AGE
+    )
+
+async def get_latest_frame() -> bytes:
+    """A JPEG from the device no older than FRAME_MAX_AGE"""
+    global _capture_task
+    if time.monotonic() - _latest_frame["at"] >= FRAME_MAX_AGE:
+        if _capture_task is None or _capture_task.done():
+            _capture_task = asyncio.create_task(capture_frame())
+        # Shielded so a viewer going away doesn't cancel the others' capture
+        await asyncio.shield(_capture_task)
+    error = _latest_frame["error"]
+    if error is not None:
+        # A fresh exception per caller; re-raising the cached one would
+        # grow one traceback across every request that shares it
+        if isinstance(error, HTTPException):
+            raise HTTPException(status_code=error.status_code, detail=error.detail)
+        raise HTTPException(status_code=502, detail=f"Camera capture failed: {error}")
+    return _latest_frame["jpeg"]
+
+async def relay_frame(response):
+    """Relay a streamed device response, releasing it however the stream ends"""
+    global _relays
+    try:
+        async for chunk in response.aiter_bytes(65536):
+            yield chunk
+    finally:
+        _relays -= 1
+        await response.aclose()
+
 @app.get("/api/camera/stream")
 async def get_camera_stream():
     """Get current camera image"""
+    global _relays
     try:
+        if frame_is_shared():
+            return Response(content=await get_latest_frame(), media_type="image/jpeg")
+        
+        # A lone viewer gets the device's response relayed as it arrives
+        # instead of buffered; the status is checked first so a failed
+        # capture can still fall back to the placeholder
         device_url = get_primary_device()
         if not device_url:
             raise HTTPException(status_code=503, detail="No edge device connected")
+        request = app.state.http.build_request("GET", f"{device_url}/capture", timeout=CAPTURE_TIMEOUT)
+        _relays += 1
+        try:
+            response = await app.state.http.send(request, stream=True)
+        except BaseException:
+            _relays -= 1
+            raise
+        if response.is_error:
+            _relays -= 1
+            await response.aclose()
+            response.raise_for_status()
         
-        # Get image from device
-        response = requests.get(f"{device_url}/capture", timeout=10)
-        response.raise_for_status()
-        
-        return StreamingResponse(
-            io.BytesIO(response.content),
-            media_type="image/jpeg"
-        )
+        return StreamingResponse(relay_frame(response), media_type="image/jpeg")
     except Exception as e:
         logger.error(f"Stream error: {e}")
         # Return placeholder image
-        placeholder_path = BASE_DIR / "static" / "placeholder-camera.png"
-        if placeholder_path.exists():
-            with open(placeholder_path, "rb") as f:
-                return StreamingResponse(
-                    io.BytesIO(f.read()),
-                    media_type="image/png"
-                )
+        if _placeholder_image is not None:
+            return Response(content=_placeholder_image, media_type="image/png")
         raise HTTPException(status_code=503, detail="Camera stream unavailable")
 
+async def mjpeg_frames():
+    global _mjpeg_viewers
+    header = f"--{MJPEG_BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: ".encode()
+    _mjpeg_viewers += 1
+    try:
+        while True:
+            try:
+                frame = await get_latest_frame()
+            except Exception as e:
+                logger.debug(f"MJPEG capture failed: {e}")
+                await asyncio.sleep(1)
+                continue
+            yield header + str(len(frame)).encode() + b"\r\n\r\n" + frame + b"\r\n"
+            await asyncio.sleep(FRAME_MAX_AGE)
+    finally:
+        _mjpeg_viewers -= 1
+
+@app.get("/api/camera/mjpeg")
+async def get_camera_mjpeg():
+    """Live camera view as a multipart/x-mixed-replace (MJPEG) stream"""
+    return StreamingResponse(
+        mjpeg_frames(),
+        media_type=f"multipart/x-mixed-replace; boundary={MJPEG_BOUNDARY}"
+    )
+
+UPLOAD_DIR = BASE_DIR / "uploads"
+IMAGE_UPLOAD_DIR = UPLOAD_DIR / "images"
+# Upload directories relative to BASE_DIR, as /api/files reports paths
+UPLOAD_REL_PATHS = {d: str(d.relative_to(BASE_DIR)) for d in (UPLOAD_DIR, IMAGE_UPLOAD_DIR)}
+
+# Multipart uploads are copied to disk in pieces of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Whether uploads can be written to unnamed O_TMPFILE files; checked at startup
+_use_tmpfile = False
+
+def tmpfile_supported(directory):
+    """Check that an O_TMPFILE can be created in directory and linked into it"""
+    if not hasattr(os, "O_TMPFILE"):
+        return False
+    probe = directory / f".tmpfile-probe-{os.getpid()}"
+    try:
+        fd = os.open(directory, os.O_WRONLY | os.O_TMPFILE, 0o644)
+        try:
+            os.link(f"/proc/self/fd/{fd}", probe)
+        finally:
+            os.close(fd)
+        probe.unlink()
+        return True
+    except OSError:
+        return False
+
+@app.on_event("startup")
+async def create_upload_dirs():
+    global _use_tmpfile
+    IMAGE_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    # The image directory sits inside the video one, so one probe covers both
+    _use_tmpfile = tmpfile_supported(IMAGE_UPLOAD_DIR)
+
+def preallocate(fd, size):
+    """Reserve the blocks for a file of known size before writing it
+    
+    The file gets one contiguous allocation instead of growing write by
+    write, and a full disk fails here instead of halfway through. Filesystems
+    that can't preallocate are simply written as usual.
+    """
+    if not size or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError as e:
+        if e.errno == errno.ENOSPC:
+            raise
+
+def open_upload_file(file_path):
+    """Open a file to write an upload into before it's published as file_path
+    
+    Where supported this is an unnamed O_TMPFILE in the target directory,
+    which never shows up in a listing and disappears by itself if the upload
+    fails. Otherwise it is a hidden temporary file next to file_path. Returns
+    the fd and the temporary path, which is None for an O_TMPFILE.
+    """
+    if _use_tmpfile:
+        return os.open(file_path.parent, os.O_WRONLY | os.O_TMPFILE, 0o644), None
+    tmp_path = file_path.with_name(f".{file_path.name}.tmp")
+    return os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644), tmp_path
+
+def publish_upload(fd, tmp_path, file_path):
+    """Give a file from open_upload_file() its final name in one step"""
+    if tmp_path is None:
+        os.link(f"/proc/self/fd/{fd}", file_path)
+    else:
+        os.replace(tmp_path, file_path)
+
+def close_upload_file(fd, tmp_path):
+    """Close a file from open_upload_file(), removing it if it wasn't published"""
+    os.close(fd)
+    if tmp_path is not None:
+        tmp_path.unlink(missing_ok=True)
+
+async def save_upload(file: UploadFile, file_path) -> int:
+    """Copy an uploaded file to file_path chunk by chunk; returns its size
+    
+    The file only appears under file_path once it's complete.
+    """
+    expected_size = getattr(file, "size", None) or 0
+    size = 0
+    fd, tmp_path = open_upload_file(file_path)
+    try:
+        async with aiofiles.open(fd, "wb", closefd=False) as buffer:
+            # Multipart parsing has already spooled the file, so its size is known
+            preallocate(fd, expected_size)
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                size += len(chunk)
+                await buffer.write(chunk)
+            if expected_size and size != expected_size:
+                await buffer.truncate(size)
+        publish_upload(fd, tmp_path, file_path)
+    finally:
+        close_upload_file(fd, tmp_path)
+    return size
+
+def upload_timestamp():
+    """Local time as YYYYmmdd_HHMMSS, and a unique filename stem starting with it
+    
+    Formatted from time.localtime() directly rather than through datetime and
+    strftime. The stem ends in the full nanosecond timestamp, like
+    /api/upload-image's filenames, so files uploaded within the same second
+    get different names.
+    """
+    now_ns = time.time_ns()
+    lt = time.localtime(now_ns // 1_000_000_000)
+    timestamp = (f"{lt.tm_year:04d}{lt.tm_mon:02d}{lt.tm_mday:02d}_"
+                 f"{lt.tm_hour:02d}{lt.tm_min:02d}{lt.tm_sec:02d}")
+    return timestamp, f"{timestamp}_{now_ns}"
+
 # Endpoint for receiving images from edge devices (raw JPEG data)
 @app.post("/api/upload-image")
 async def upload_image(request: Request):
     """Receive raw JPEG images from edge devices"""
     try:
-        # Create uploads directory if it doesn't exist
-        upload_dir = BASE_DIR / "uploads" / "images"
-        os.makedirs(upload_dir, exist_ok=True)
-        
-        # Read raw image data from request body
-        content = await request.body()
+        # Name the file by nanosecond timestamp so frames uploaded within the
+        # same second don't overwrite each other
+        received_ns = time.time_ns()
+        filename = f"{received_ns}_stream.jpg"
+        file_path = IMAGE_UPLOAD_DIR / filename
         
-        if not content:
-            raise HTTPException(status_code=400, detail="No image data received")
-        
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_stream.jpg"
-        file_path = upload_dir / filename
-        
-        # Save the raw JPEG data
-        with open(file_path, "wb") as buffer:
-            buffer.write(content)
+        # Write the raw JPEG data as it arrives rather than buffering the body.
+        # It's only published under its name once complete, so an interrupted
+        # upload never shows up as an image
+        try:
+            expected_size = int(request.headers.get("content-length", 0))
+        except ValueError:
+            expected_size = 0
+        size = 0
+        fd, tmp_path = open_upload_file(file_path)
+        try:
+            async with aiofiles.open(fd, "wb", closefd=False) as buffer:
+                preallocate(fd, expected_size)
+                async for chunk in request.stream():
+                    size += len(chunk)
+                    await buffer.write(chunk)
+                if expected_size and size != expected_size:
+                    await buffer.truncate(size)
+            if not size:
+                raise HTTPException(status_code=400, detail="No image data received")
+            publish_upload(fd, tmp_path, file_path)
+        finally:
+            close_upload_file(fd, tmp_path)
+        invalidate_file_listing()
         
         # Print full file path where image was saved
-        full_path = str(file_path.absolute())
-        logger.info(f"Received image stream: {filename} ({len(content)} bytes)")
+        full_path = str(file_path)
+        logger.info(f"Received image stream: {filename} ({size} bytes)")
         logger.info(f"Image saved to: {full_path}")
-        print(f"✓ Image uploaded and saved to: {full_path}")
         
         return {
             "success": True,
             "filename": filename,
-            "size": len(content),
-            "timestamp": timestamp,
+            "size": size,
+            "timestamp": time.strftime("%Y%m%d_%H%M%S", time.localtime(received_ns // 1_000_000_000)),
             "file_path": full_path
         }
     except Exception as e:
@@ -839,30 +1290,24 @@ async def upload_image(request: Request):
 async def upload_image_file(file: UploadFile = File(...)):
     """Receive images as multipart form data"""
     try:
-        # Create uploads directory if it doesn't exist
-        upload_dir = BASE_DIR / "uploads" / "images"
-        os.makedirs(upload_dir, exist_ok=True)
-        
         # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{timestamp}_{file.filename or 'upload.jpg'}"
-        file_path = upload_dir / filename
+        timestamp, stem = upload_timestamp()
+        filename = f"{stem}_{file.filename or 'upload.jpg'}"
+        file_path = IMAGE_UPLOAD_DIR / filename
         
         # Save the file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        size = await save_upload(file, file_path)
+        invalidate_file_listing()
         
         # Print full file path where image was saved
-        full_path = str(file_path.absolute())
-        logger.info(f"Received image file: {filename} ({len(content)} bytes)")
+        full_path = str(file_path)
+        logger.info(f"Received image file: {filename} ({size} bytes)")
         logger.info(f"Image file saved to: {full_path}")
-        print(f"✓ Image file uploaded and saved to: {full_path}")
         
         return {
             "success": True,
             "filename": filename,
-            "size": len(content),
+            "size": size,
             "timestamp": timestamp,
             "file_path": full_path
         }
@@ -875,78 +1320,259 @@ async def upload_image_file(file: UploadFile = File(...)):
 async def upload_file(file: UploadFile = File(...)):
     """Upload endpoint for video files"""
     try:
-        # Create uploads directory if it doesn't exist
-        upload_dir = BASE_DIR / "uploads"
-        os.makedirs(upload_dir, exist_ok=True)
-        
         # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        _, stem = upload_timestamp()
         file_extension = os.path.splitext(file.filename)[1] if file.filename else ""
-        filename = f"{timestamp}{file_extension}"
-        file_path = upload_dir / filename
+        filename = f"{stem}{file_extension}"
+        file_path = UPLOAD_DIR / filename
         
         # Save the file
-        with open(file_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
+        size = await save_upload(file, file_path)
+        invalidate_file_listing()
         
         # Print full file path where video was saved
-        full_path = str(file_path.absolute())
-        logger.info(f"File uploaded: {filename} ({len(content)} bytes)")
+        full_path = str(file_path)
+        logger.info(f"File uploaded: {filename} ({size} bytes)")
         logger.info(f"Video file saved to: {full_path}")
-        print(f"✓ Video uploaded and saved to: {full_path}")
         
         return {
             "message": "Upload successful",
             "filename": filename,
-            "size": len(content),
+            "size": size,
             "file_path": full_path
         }
     except Exception as e:
         logger.error(f"Video upload error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Chunked uploads: /upload/init announces a file, each /upload/chunk/{id}/{seq}
+# carries one Content-Range piece of it, and /upload/complete moves the finished
+# file into place. Chunks may arrive in any order or in parallel, and a failed
+# chunk is resent on its own instead of restarting the whole upload.
+UPLOAD_SESSION_TTL = 3600  # seconds an unfinished upload is kept
+CONTENT_RANGE = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+upload_sessions: Dict[str, Dict[str, Any]] = {}
+
+def _discard_upload_session(upload_id):
+    session = upload_sessions.pop(upload_id)
+    os.close(session["fd"])
+    session["tmp_path"].unlink(missing_ok=True)
+
+def _add_range(received, start, end):
+    """Add [start, end) to a sorted list of disjoint ranges, merging neighbours"""
+    merged = []
+    for lo, hi in sorted(received + [(start, end)]):
+        if merged and lo <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+        else:
+            merged.append((lo, hi))
+    return merged
+
+def _missing_ranges(session):
+    """Inclusive [first, last] byte ranges not received yet"""
+    missing, pos = [], 0
+    for start, end in session["received"]:
+        if start > pos:
+            missing.append([pos, start - 1])
+        pos = end
+    if pos < session["size"]:
+        missing.append([pos, session["size"] - 1])
+    return missing
+
+@app.post("/upload/init")
+async def init_chunked_upload(upload: UploadInit):
+    """Start a chunked upload of a file of known size"""
+    if upload.size < 0:
+        raise HTTPException(status_code=400, detail="Size must not be negative")
+    
+    # Drop uploads the device gave up on
+    now = time.time()
+    for upload_id, session in list(upload_sessions.items()):
+        if not session["writes"] and now - session["last_active"] > UPLOAD_SESSION_TTL:
+            logger.info(f"Dropping abandoned upload {upload_id}")
+            _discard_upload_session(upload_id)
+    
+    upload_id = uuid.uuid4().hex
+    tmp_path = UPLOAD_DIR / f".{upload_id}.part"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    # Reserve the whole file up front so out-of-order chunks don't fragment it,
+    # and a full disk is reported now rather than partway through the upload
+    try:
+        preallocate(fd, upload.size)
+    except OSError:
+        os.close(fd)
+        tmp_path.unlink(missing_ok=True)
+        raise HTTPException(status_code=507, detail="Not enough space for the upload")
+    
+    upload_sessions[upload_id] = {
+        "filename": upload.filename,
+        "size": upload.size,
+        "tmp_path": tmp_path,
+        "fd": fd,
+        "received": [],
+        "writes": 0,
+        "last_active": now
+    }
+    logger.info(f"Chunked upload {upload_id} started: {upload.filename} ({upload.size} bytes)")
+    return {"upload_id": upload_id, "size": upload.size}
+
+@app.post("/upload/chunk/{upload_id}/{seq}")
+async def upload_chunk(upload_id: str, seq: int, request: Request):
+    """Store one piece of a chunked upload at the offset given by Content-Range"""
+    session = upload_sessions.get(upload_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Unknown upload")
+    
+    match = CONTENT_RANGE.fullmatch(request.headers.get("content-range", ""))
+    if not match:
+        raise HTTPException(status_code=400, detail="Content-Range: bytes start-end/size header required")
+    start, end = int(match[1]), int(match[2]) + 1
+    if match[3] != "*" and int(match[3]) != session["size"]:
+        raise HTTPException(status_code=400, detail="Content-Range size doesn't match the announced size")
+    if end <= start or end > session["size"]:
+        raise HTTPException(status_code=416, detail="Range outside the announced size")
+    
+    # The counter keeps the session and its fd alive from here until the
+    # write returns: /upload/complete and the abandoned-upload sweep both
+    # leave a session alone while it has chunks in flight, including ones
+    # whose body is still arriving
+    session["writes"] += 1
+    try:
+        data = await request.body()
+        if len(data) != end - start:
+            raise HTTPException(status_code=400, detail="Body length doesn't match Content-Range")
+        # pwrite takes the offset itself, so parallel chunks never race on a
+        # shared file position
+        await asyncio.to_thread(os.pwrite, session["fd"], data, start)
+    finally:
+        session["writes"] -= 1
+    session["received"] = _add_range(session["received"], start, end)
+    session["last_active"] = time.time()
+    
+    missing = _missing_ranges(session)
+    return {
+        "upload_id": upload_id,
+        "seq": seq,
+        "received": sum(hi - lo for lo, hi in session["received"]),
+        "missing": missing
+    }
+
+@app.post("/upload/complete")
+async def complete_chunked_upload(upload: UploadComplete):
+    """Finish a chunked upload once every byte has arrived"""
+    session = upload_sessions.get(upload.upload_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Unknown upload")
+    if session["writes"]:
+        raise HTTPException(status_code=409, detail="Chunks are still being written")
+    missing = _missing_ranges(session)
+    if missing:
+        raise HTTPException(status_code=409, detail={"message": "Upload incomplete", "missing": missing})
+    
+    # Same naming as /upload
+    _, stem = upload_timestamp()
+    file_extension = os.path.splitext(session["filename"])[1] if session["filename"] else ""
+    filename = f"{stem}{file_extension}"
+    file_path = UPLOAD_DIR / filename
+    
+    # Take the session out first so a repeated /upload/complete can't race
+    # this one while the data is flushed, then make sure every chunk is on
+    # disk before the file appears under its final name
+    del upload_sessions[upload.upload_id]
+    try:
+        await asyncio.to_thread(os.fsync, session["fd"])
+    except BaseException:
+        os.close(session["fd"])
+        session["tmp_path"].unlink(missing_ok=True)
+        raise
+    os.close(session["fd"])
+    os.replace(session["tmp_path"], file_path)
+    invalidate_file_listing()
+    
+    full_path = str(file_path)
+    logger.info(f"Chunked upload {upload.upload_id} complete: {filename} ({session['size']} bytes)")
+    logger.info(f"Video file saved to: {full_path}")
+    
+    return {
+        "message": "Upload successful",
+        "filename": filename,
+        "size": session["size"],
+        "file_path": full_path
+    }
+
 # File Management APIs
-@app.get("/api/files")
-async def list_server_files():
-    """List all files on the server"""
+# Listings of the upload directories are reused for a few seconds, and until the
+# directory itself changes or one of the upload/clear endpoints writes to it
+FILE_LIST_TTL = 5.0
+_file_list_cache: Dict[Path, tuple] = {}  # directory -> (listed at, dir mtime, (files, total size))
+# One lock per directory, so the two directories can be rescanned at the same time
+_file_list_locks = {directory: asyncio.Lock() for directory in UPLOAD_REL_PATHS}
+
+def invalidate_file_listing():
+    _file_list_cache.clear()
+
+def list_upload_dir(directory, file_type):
+    """Describe the files in one upload directory as /api/files reports them
+    
+    Returns the file entries and their total size.
+    """
+    files = []
+    total_size = 0
+    rel_dir = UPLOAD_REL_PATHS[directory]
     try:
-        upload_dir = BASE_DIR / "uploads"
-        images_dir = upload_dir / "images"
-        
-        files = []
-        total_size = 0
-        
-        # List video files
-        if upload_dir.exists():
-            for file_path in upload_dir.iterdir():
-                if file_path.is_file() and not file_path.name.startswith('.'):
-                    file_size = file_path.stat().st_size
+        # scandir entries carry the file type from the directory read, and
+        # cache their stat() result
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False) and not entry.name.startswith('.'):
+                    st = entry.stat(follow_symlinks=False)
+                    total_size += st.st_size
                     files.append({
-                        "name": file_path.name,
-                        "size": file_size,
-                        "path": str(file_path.relative_to(BASE_DIR)),
-                        "type": "video",
-                        "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
+                        "name": entry.name,
+                        "size": st.st_size,
+                        "path": os.path.join(rel_dir, entry.name),
+                        "type": file_type,
+                        "modified": st.st_mtime
                     })
-                    total_size += file_size
-        
-        # List image files
-        if images_dir.exists():
-            for file_path in images_dir.iterdir():
-                if file_path.is_file() and not file_path.name.startswith('.'):
-                    file_size = file_path.stat().st_size
-                    files.append({
-                        "name": file_path.name,
-                        "size": file_size,
-                        "path": str(file_path.relative_to(BASE_DIR)),
-                        "type": "image",
-                        "modified": datetime.fromtimestamp(file_path.stat().st_mtime).isoformat()
-                    })
-                    total_size += file_size
+    except FileNotFoundError:
+        pass
+    return files, total_size
+
+async def cached_upload_listing(directory, file_type):
+    # The lock makes concurrent requests share one rebuild instead of each scanning
+    async with _file_list_locks[directory]:
+        now = time.monotonic()
+        try:
+            mtime = directory.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        cached = _file_list_cache.get(directory)
+        if cached and now - cached[0] < FILE_LIST_TTL and cached[1] == mtime:
+            return cached[2]
+        listing = await asyncio.to_thread(list_upload_dir, directory, file_type)
+        _file_list_cache[directory] = (now, mtime, listing)
+        return listing
+
+@app.get("/api/files")
+async def list_server_files(iso: bool = False):
+    """List all files on the server
+    
+    "modified" is a Unix timestamp; pass ?iso=true for ISO 8601 strings.
+    """
+    try:
+        # Scan the video and image directories concurrently
+        (videos, videos_size), (images, images_size) = await asyncio.gather(
+            cached_upload_listing(UPLOAD_DIR, "video"),
+            cached_upload_listing(IMAGE_UPLOAD_DIR, "image"),
+        )
+        files = videos + images
+        total_size = videos_size + images_size
         
         # Sort by modification time (newest first)
-        files.sort(key=lambda x: x["modified"], reverse=True)
+        files.sort(key=itemgetter("modified"), reverse=True)
+        if iso:
+            files = [{**f, "modified": datetime.fromtimestamp(f["modified"]).isoformat()}
+                     for f in files]
         
         return {
             "files": files,
@@ -958,45 +1584,68 @@ async def list_server_files():
         logger.error(f"List files error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Threads used to unlink files when clearing the upload directories
+MAX_DELETE_WORKERS = 32
+
+def find_uploaded_files(directories):
+    """(path, size) of every visible file directly inside the given directories"""
+    targets = []
+    for directory in directories:
+        if not directory.exists():
+            continue
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_file(follow_symlinks=False) and not entry.name.startswith('.'):
+                    try:
+                        targets.append((entry.path, entry.stat(follow_symlinks=False).st_size))
+                    except FileNotFoundError:
+                        pass  # Removed since the directory was read
+    return targets
+
+def _safe_unlink(path):
+    """Delete a file; returns the error instead of raising it"""
+    try:
+        os.unlink(path)
+    except OSError as e:
+        return e
+    return None
+
 @app.post("/api/clear-files")
 async def clear_server_files():
     """Clear all uploaded files from the server"""
     try:
-        upload_dir = BASE_DIR / "uploads"
-        images_dir = upload_dir / "images"
+        # Collect video and image files first, then unlink them all in parallel
+        targets = await asyncio.to_thread(find_uploaded_files, (UPLOAD_DIR, IMAGE_UPLOAD_DIR))
+        errors = []
+        if targets:
+            loop = asyncio.get_running_loop()
+            with ThreadPoolExecutor(max_workers=min(MAX_DELETE_WORKERS, len(targets))) as pool:
+                errors = await asyncio.gather(*(loop.run_in_executor(pool, _safe_unlink, path)
+                                                for path, _ in targets))
         
-        deleted_count = 0
-        failed_count = 0
+        # Per-file lines only at DEBUG; one summary line otherwise
+        deleted_names = []
+        failed = []
         total_size_freed = 0
+        for (path, file_size), error in zip(targets, errors):
+            name = os.path.basename(path)
+            if error:
+                failed.append((name, error))
+                logger.debug("Failed to delete %s: %s", name, error)
+            else:
+                deleted_names.append(name)
+                total_size_freed += file_size
+                logger.debug("Deleted %s", name)
+        deleted_count = len(deleted_names)
+        failed_count = len(failed)
+        logger.info("Cleared %d files (%d failed), %.2f MB freed; first=%s last=%s",
+                    deleted_count, failed_count, total_size_freed / (1024 * 1024),
+                    deleted_names[0] if deleted_names else "-",
+                    deleted_names[-1] if deleted_names else "-")
+        if failed:
+            logger.error("Failed to delete %d files, e.g. %s: %s", failed_count, *failed[0])
         
-        # Delete video files
-        if upload_dir.exists():
-            for file_path in upload_dir.iterdir():
-                if file_path.is_file() and not file_path.name.startswith('.'):
-                    try:
-                        file_size = file_path.stat().st_size
-                        file_path.unlink()
-                        deleted_count += 1
-                        total_size_freed += file_size
-                        logger.info(f"Deleted video file: {file_path.name}")
-                    except Exception as e:
-                        failed_count += 1
-                        logger.error(f"Failed to delete {file_path.name}: {e}")
-        
-        # Delete image files
-        if images_dir.exists():
-            for file_path in images_dir.iterdir():
-                if file_path.is_file() and not file_path.name.startswith('.'):
-                    try:
-                        file_size = file_path.stat().st_size
-                        file_path.unlink()
-                        deleted_count += 1
-                        total_size_freed += file_size
-                        logger.info(f"Deleted image file: {file_path.name}")
-                    except Exception as e:
-                        failed_count += 1
-                        logger.error(f"Failed to delete {file_path.name}: {e}")
-        
+        invalidate_file_listing()
         return {
             "success": True,
             "message": f"Cleared server files: deleted {deleted_count} files, freed {round(total_size_freed / (1024 * 1024), 2)} MB",
@@ -1018,7 +1667,7 @@ async def list_device_files():
             raise HTTPException(status_code=503, detail="No edge device connected")
         
         # Get files from device
-        response = requests.get(f"{device_url}/files", timeout=10)
+        response = await app.state.http.get(f"{device_url}/files", timeout=10)
         response.raise_for_status()
         
         device_data = response.json()
@@ -1042,7 +1691,7 @@ async def clear_device_files():
             raise HTTPException(status_code=503, detail="No edge device connected")
         
         # Send clear command to device
-        response = requests.post(
+        response = await app.state.http.post(
             f"{device_url}/command",
             json={"command": "clear_sd"},
             timeout=30
@@ -1063,23 +1712,14 @@ async def clear_device_files():
 
 if __name__ == "__main__":
     # Create necessary directories using absolute paths
-    os.makedirs(BASE_DIR / "uploads", exist_ok=True)
-    os.makedirs(BASE_DIR / "uploads" / "images", exist_ok=True)
     os.makedirs(BASE_DIR / "static", exist_ok=True)
     os.makedirs(BASE_DIR / "templates", exist_ok=True)
     
     # Create placeholder image if it doesn't exist
-    placeholder_path = BASE_DIR / "static" / "placeholder-camera.png"
-    if not placeholder_path.exists():
+    if not PLACEHOLDER_PATH.exists():
         # Create a simple placeholder (you can replace with actual image)
-        with open(placeholder_path, "w") as f:
+        with open(PLACEHOLDER_PATH, "w") as f:
             f.write("Placeholder for camera image")
     
-    # Load saved device configuration
-    load_device_config()
-    if configured_device:
-        logger.info(f"Using configured device: {configured_device['ip']}:{configured_device.get('port', 80)}")
-    else:
-        logger.info("No device configured. Please configure a device through the web interface.")
-    
+    # uvicorn uses uvloop and httptools automatically when they are installed
     uvicorn.run(app, host="0.0.0.0", port=8000)
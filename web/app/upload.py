@@ -1,10 +1,12 @@
 import os
-import shutil
+import aiofiles
 import requests
 from fastapi import APIRouter, File, UploadFile, Request, HTTPException
 from fastapi.responses import HTMLResponse
 
 UPLOAD_FOLDER = "shared/uploads"
+# Uploads are copied to disk in pieces of this size
+CHUNK_SIZE = 1 << 20
 
 router = APIRouter()
 
@@ -26,8 +28,9 @@ async def upload_file(file: UploadFile = File(...)):
     os.makedirs(UPLOAD_FOLDER, exist_ok=True)
     file_path = os.path.join(UPLOAD_FOLDER, file.filename)
 
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
+    async with aiofiles.open(file_path, "wb") as buffer:
+        while chunk := await file.read(CHUNK_SIZE):
+            await buffer.write(chunk)
 
     # Trigger processor (dummy call here)
     try: